@@ -3,14 +3,67 @@ Simple REST API Simulator
 A basic Flask API for demonstrating automated testing.
 """
 
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, request, jsonify
 from calculator import Calculator
+from history_index import HistoryIndex
+from compression import init_compression
+from vector_ops import VectorCalculator, decode_array, encode_array, shape_of, to_list
+from typing import Any, Dict, Optional
 import json
+import logging
+import os
+import time
 
-app = Flask(__name__)
-calculator = Calculator()
+api = Blueprint('api', __name__)
 
-@app.route('/health', methods=['GET'])
+DEFAULT_CONFIG = {
+    # 'memory' keeps history per process; 'shared' shares it between the
+    # worker processes of a pre-fork server through shared memory
+    'HISTORY_BACKEND': 'memory',
+    'HISTORY_NAME': 'calculator-history',
+    'HISTORY_CAPACITY': 1024,
+    'HISTORY_RECORD_SIZE': 256,
+    # Width of the time buckets used for history aggregates
+    'HISTORY_BUCKET_SECONDS': 60,
+    # Micro-batch concurrent add/subtract/multiply requests (see batching.py)
+    'BATCHING': False,
+    'BATCH_WINDOW_MS': 1.0,
+    'BATCH_MAX_SIZE': 64,
+}
+
+# Settings that may also come from environment variables of the same name
+INT_SETTINGS = ('HISTORY_CAPACITY', 'HISTORY_RECORD_SIZE', 'HISTORY_BUCKET_SECONDS',
+                'BATCH_MAX_SIZE')
+FLOAT_SETTINGS = ('BATCH_WINDOW_MS',)
+FLAG_SETTINGS = ('BATCHING',)
+FLAG_VALUES = {'1': True, 'true': True, 'yes': True, 'on': True,
+               '0': False, 'false': False, 'no': False, 'off': False}
+
+# Records returned by /api/history/query when no limit is given
+DEFAULT_QUERY_LIMIT = 100
+
+INDEX_UNAVAILABLE = 'History queries are not available with the shared history backend'
+
+# Built by get_app() on first use rather than at import time
+_default_app = None
+
+# Vector operations and the operands each one takes
+VECTOR_OPERATIONS = {
+    'add': ('a', 'b'),
+    'subtract': ('a', 'b'),
+    'multiply': ('a', 'b'),
+    'divide': ('a', 'b'),
+    'dot': ('a', 'b'),
+    'matmul': ('a', 'b'),
+    'sum': ('values',),
+    'mean': ('values',),
+    'min': ('values',),
+    'max': ('values',),
+}
+
+BINARY_MIMETYPE = 'application/octet-stream'
+
+@api.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
@@ -18,7 +71,7 @@ def health_check():
         'message': 'API is running'
     }), 200
 
-@app.route('/api/calculate/add', methods=['POST'])
+@api.route('/api/calculate/add', methods=['POST'])
 def add_numbers():
     """Add two numbers via API."""
     try:
@@ -28,7 +81,7 @@ def add_numbers():
         
         a = float(data['a'])
         b = float(data['b'])
-        result = calculator.add(a, b)
+        result = calculate_pair('add', a, b)
         
         return jsonify({
             'operation': 'add',
@@ -41,7 +94,7 @@ def add_numbers():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/subtract', methods=['POST'])
+@api.route('/api/calculate/subtract', methods=['POST'])
 def subtract_numbers():
     """Subtract two numbers via API."""
     try:
@@ -51,7 +104,7 @@ def subtract_numbers():
         
         a = float(data['a'])
         b = float(data['b'])
-        result = calculator.subtract(a, b)
+        result = calculate_pair('subtract', a, b)
         
         return jsonify({
             'operation': 'subtract',
@@ -64,7 +117,7 @@ def subtract_numbers():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/multiply', methods=['POST'])
+@api.route('/api/calculate/multiply', methods=['POST'])
 def multiply_numbers():
     """Multiply two numbers via API."""
     try:
@@ -74,7 +127,7 @@ def multiply_numbers():
         
         a = float(data['a'])
         b = float(data['b'])
-        result = calculator.multiply(a, b)
+        result = calculate_pair('multiply', a, b)
         
         return jsonify({
             'operation': 'multiply',
@@ -87,7 +140,7 @@ def multiply_numbers():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/divide', methods=['POST'])
+@api.route('/api/calculate/divide', methods=['POST'])
 def divide_numbers():
     """Divide two numbers via API."""
     try:
@@ -97,7 +150,7 @@ def divide_numbers():
         
         a = float(data['a'])
         b = float(data['b'])
-        result = calculator.divide(a, b)
+        result = get_calculator().divide(a, b)
         
         return jsonify({
             'operation': 'divide',
@@ -110,7 +163,7 @@ def divide_numbers():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/power', methods=['POST'])
+@api.route('/api/calculate/power', methods=['POST'])
 def power_numbers():
     """Raise a number to a power via API."""
     try:
@@ -120,7 +173,7 @@ def power_numbers():
         
         base = float(data['base'])
         exponent = float(data['exponent'])
-        result = calculator.power(base, exponent)
+        result = get_calculator().power(base, exponent)
         
         return jsonify({
             'operation': 'power',
@@ -133,7 +186,7 @@ def power_numbers():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/sqrt', methods=['POST'])
+@api.route('/api/calculate/sqrt', methods=['POST'])
 def square_root():
     """Calculate square root via API."""
     try:
@@ -142,7 +195,7 @@ def square_root():
             return jsonify({'error': 'Missing required parameter: number'}), 400
         
         number = float(data['number'])
-        result = calculator.square_root(number)
+        result = get_calculator().square_root(number)
         
         return jsonify({
             'operation': 'square_root',
@@ -154,7 +207,7 @@ def square_root():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/factorial', methods=['POST'])
+@api.route('/api/calculate/factorial', methods=['POST'])
 def factorial():
     """Calculate factorial via API."""
     try:
@@ -163,7 +216,7 @@ def factorial():
             return jsonify({'error': 'Missing required parameter: number'}), 400
         
         number = int(data['number'])
-        result = calculator.factorial(number)
+        result = get_calculator().factorial(number)
         
         return jsonify({
             'operation': 'factorial',
@@ -175,7 +228,7 @@ def factorial():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/calculate/average', methods=['POST'])
+@api.route('/api/calculate/average', methods=['POST'])
 def average():
     """Calculate average via API."""
     try:
@@ -184,7 +237,7 @@ def average():
             return jsonify({'error': 'Missing required parameter: numbers'}), 400
         
         numbers = [float(x) for x in data['numbers']]
-        result = calculator.average(numbers)
+        result = get_calculator().average(numbers)
         
         return jsonify({
             'operation': 'average',
@@ -196,20 +249,258 @@ def average():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
-@app.route('/api/history', methods=['GET'])
+def _parse_shape(header):
+    """Parse an X-Shape-* header such as "3" or "2,3" into a tuple."""
+    if not header:
+        raise ValueError('Missing shape header for binary operand')
+    try:
+        return tuple(int(dim) for dim in header.split(','))
+    except ValueError:
+        raise ValueError(f'Invalid shape header: {header}')
+
+
+def _read_vector_operands(names):
+    """
+    Read vector operands from the request body.
+
+    JSON bodies carry the operands by name. Binary bodies are the operands'
+    little-endian float64 data concatenated in order, with each operand's
+    shape given by an X-Shape-<NAME> header (e.g. X-Shape-A: 2,3).
+    Returns None when a JSON operand is missing.
+    """
+    if request.mimetype == BINARY_MIMETYPE:
+        body = request.get_data()
+        operands = {}
+        offset = 0
+        for name in names:
+            shape = _parse_shape(request.headers.get(f'X-Shape-{name.upper()}'))
+            size = 8
+            for dim in shape:
+                size *= dim
+            operands[name] = decode_array(body[offset:offset + size], shape)
+            offset += size
+        if offset != len(body):
+            raise ValueError('Binary payload size does not match shape headers')
+        return operands
+
+    data = request.get_json()
+    if not data or any(name not in data for name in names):
+        return None
+    return {name: data[name] for name in names}
+
+
+@api.route('/api/vector/<operation>', methods=['POST'])
+def vector_operation(operation):
+    """Run a vector or matrix operation via API (JSON or binary arrays)."""
+    if operation not in VECTOR_OPERATIONS:
+        return jsonify({'error': f'Unknown vector operation: {operation}'}), 404
+    names = VECTOR_OPERATIONS[operation]
+    try:
+        operands = _read_vector_operands(names)
+        if operands is None:
+            return jsonify({'error': f"Missing required parameters: {' and '.join(names)}"}), 400
+
+        result = getattr(get_vector_calculator(), operation)(*(operands[name] for name in names))
+
+        if isinstance(result, float):
+            return jsonify({'operation': operation, 'result': result}), 200
+        best = request.accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE])
+        if best == BINARY_MIMETYPE:
+            response = Response(encode_array(result), mimetype=BINARY_MIMETYPE)
+            response.headers['X-Shape'] = ','.join(str(dim) for dim in shape_of(result))
+            return response, 200
+        return jsonify({
+            'operation': operation,
+            'shape': list(shape_of(result)),
+            'result': to_list(result)
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@api.route('/api/history', methods=['GET'])
 def get_history():
     """Get calculation history."""
     return jsonify({
-        'history': calculator.get_history()
+        'history': get_calculator().get_history()
     }), 200
 
-@app.route('/api/history', methods=['DELETE'])
+@api.route('/api/history', methods=['DELETE'])
 def clear_history():
     """Clear calculation history."""
-    calculator.clear_history()
+    get_calculator().clear_history()
     return jsonify({
         'message': 'History cleared successfully'
     }), 200
 
+def _float_arg(name):
+    """Optional float query parameter."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value}")
+
+
+def _history_filters():
+    """
+    Parse history filters from the query string.
+
+    `start` and `end` are Unix timestamps; `last` selects the last N seconds
+    and takes precedence over `start`.
+    """
+    start = _float_arg('start')
+    last = _float_arg('last')
+    if last is not None:
+        start = time.time() - last
+    return {
+        'op': request.args.get('op') or None,
+        'start': start,
+        'end': _float_arg('end'),
+        'min_result': _float_arg('min_result'),
+        'max_result': _float_arg('max_result'),
+    }
+
+
+@api.route('/api/history/query', methods=['GET'])
+def query_history():
+    """Query indexed history by operation, time range, result range and status."""
+    try:
+        index = get_calculator().index
+        if index is None:
+            return jsonify({'error': INDEX_UNAVAILABLE}), 501
+        filters = _history_filters()
+        limit = request.args.get('limit', str(DEFAULT_QUERY_LIMIT))
+        if not limit.isdigit():
+            return jsonify({'error': 'limit must be a non-negative integer'}), 400
+        records = index.query(status=request.args.get('status') or None, limit=int(limit),
+                              **filters)
+        return jsonify({'filters': filters, 'count': len(records), 'records': records}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@api.route('/api/history/aggregate', methods=['GET'])
+def aggregate_history():
+    """Count, errors, sum, mean, min and max of indexed history."""
+    try:
+        index = get_calculator().index
+        if index is None:
+            return jsonify({'error': INDEX_UNAVAILABLE}), 501
+        filters = _history_filters()
+        return jsonify({'filters': filters, **index.aggregate(**filters)}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """Create the API app with its own Calculator and history."""
+    app = Flask(__name__)
+    if config:
+        app.config.update(config)
+    for key, value in DEFAULT_CONFIG.items():
+        app.config.setdefault(key, environment_setting(key, value))
+    init_compression(app)
+    calculator = Calculator(history=create_history(app.config), index=create_index(app.config))
+    app.extensions['calculator'] = calculator
+    app.extensions['vector_calculator'] = VectorCalculator(history=calculator.history)
+    if app.config['BATCHING']:
+        # Imported here so apps without batching do not pay for it
+        from batching import MicroBatcher
+        app.extensions['batcher'] = MicroBatcher(calculator, app.config['BATCH_WINDOW_MS'] / 1000,
+                                                 app.config['BATCH_MAX_SIZE'])
+    app.register_blueprint(api)
+    return app
+
+
+def environment_setting(key: str, default: Any) -> Any:
+    """Read a setting from the environment, falling back to its default."""
+    value = os.environ.get(key)
+    if value is None:
+        return default
+    if key in INT_SETTINGS:
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{key} must be an integer, got {value!r}")
+    if key in FLOAT_SETTINGS:
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"{key} must be a number, got {value!r}")
+    if key in FLAG_SETTINGS:
+        try:
+            return FLAG_VALUES[value.strip().lower()]
+        except KeyError:
+            raise ValueError(f"{key} must be true or false, got {value!r}")
+    return value
+
+
+def create_history(config: Dict[str, Any]):
+    """Create the history store selected by HISTORY_BACKEND."""
+    backend = config['HISTORY_BACKEND']
+    if backend == 'memory':
+        return []
+    if backend == 'shared':
+        # Imported here so the default backend does not pay for it
+        from shared_history import SharedHistory
+        return SharedHistory(config['HISTORY_NAME'], config['HISTORY_CAPACITY'],
+                             config['HISTORY_RECORD_SIZE'])
+    raise ValueError(f"Unknown history backend: {backend}")
+
+
+def create_index(config: Dict[str, Any]) -> Optional[HistoryIndex]:
+    """
+    Create the history index, or None for the shared backend.
+    
+    The index lives in one process, so with a shared history each worker
+    would answer queries from only its own calculations.
+    """
+    if config['HISTORY_BACKEND'] == 'shared':
+        return None
+    return HistoryIndex(config['HISTORY_BUCKET_SECONDS'], capacity=config['HISTORY_CAPACITY'])
+
+
+def get_app() -> Flask:
+    """Return the module's default app, creating it on first use."""
+    global _default_app
+    if _default_app is None:
+        _default_app = create_app()
+    return _default_app
+
+
+def get_calculator() -> Calculator:
+    """Calculator of the app handling the current request."""
+    return current_app.extensions['calculator']
+
+
+def calculate_pair(operation: str, a: float, b: float) -> float:
+    """Run a binary calculator operation, through the app's batcher when batching is on."""
+    batcher = current_app.extensions.get('batcher')
+    if batcher is not None:
+        return batcher.submit(operation, a, b)
+    return getattr(get_calculator(), operation)(a, b)
+
+
+def get_vector_calculator() -> VectorCalculator:
+    """VectorCalculator of the app handling the current request."""
+    return current_app.extensions['vector_calculator']
+
+
+def __getattr__(name):
+    """Lazily provide the default `app`, `calculator` and `vector_calculator`."""
+    if name == 'app':
+        return get_app()
+    if name in ('calculator', 'vector_calculator'):
+        return get_app().extensions[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,149 @@
+"""
+Request Batching Module
+Collects concurrent single-operation requests for a short window and runs
+them as one batch against a Calculator, handing each caller its own result.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from calculator import BATCH_OPERATIONS, Calculator
+
+# Seconds the dispatcher waits for more requests after the first one arrives
+DEFAULT_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 64
+
+
+class _Pending:
+    """One submitted operation waiting for its batch to run."""
+
+    __slots__ = ('operation', 'a', 'b', 'done', 'result', 'error')
+
+    def __init__(self, operation: str, a: Union[int, float], b: Union[int, float]):
+        self.operation = operation
+        self.a = a
+        self.b = b
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Micro-batching dispatcher for binary calculator operations.
+
+    Callers block in submit() while a dispatcher thread collects requests:
+    a batch closes `window` seconds after its first request arrives, or as
+    soon as it holds `max_batch` requests. Each batch runs through
+    Calculator.batch() once per operation, so the history and index see the
+    same entries as unbatched calls, and every caller gets its own result.
+
+    Batching trades latency for throughput: a request waits up to one window
+    for company, which pays off only when enough requests arrive together.
+
+    The dispatcher thread starts on first use in each process, so a batcher
+    created before a pre-fork server forks works in every worker.
+    """
+
+    def __init__(self, calculator: Calculator, window: float = DEFAULT_WINDOW,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        if window < 0:
+            raise ValueError("Batch window must not be negative")
+        if max_batch < 1:
+            raise ValueError("Maximum batch size must be at least 1")
+        self.calculator = calculator
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, operation: str, a: Union[int, float],
+               b: Union[int, float]) -> Union[int, float]:
+        """Run one operation as part of the next batch and return its result."""
+        if operation not in BATCH_OPERATIONS:
+            raise ValueError(f"Operation cannot be batched: {operation}")
+        pending = _Pending(operation, a, b)
+        self._dispatcher_queue().put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _dispatcher_queue(self) -> 'queue.SimpleQueue':
+        """Queue of this process's dispatcher thread, starting it if needed."""
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.SimpleQueue()
+                    self._thread = threading.Thread(target=self._run, args=(self._queue,),
+                                                    name='micro-batcher', daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def _run(self, requests: 'queue.SimpleQueue') -> None:
+        """Collect and execute batches until close() sends None."""
+        while True:
+            pending = requests.get()
+            if pending is None:
+                return
+            batch = [pending]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        pending = requests.get(timeout=timeout)
+                    else:
+                        pending = requests.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    self._execute(batch)
+                    return
+                batch.append(pending)
+            self._execute(batch)
+
+    def _execute(self, batch: List[_Pending]) -> None:
+        """Run a batch, one Calculator.batch() call per operation, and wake its callers."""
+        # Counted before any caller wakes, so stats() already include this batch
+        self.batches += 1
+        self.requests += len(batch)
+        groups = {}
+        for pending in batch:
+            groups.setdefault(pending.operation, []).append(pending)
+        for operation, group in groups.items():
+            try:
+                results = self.calculator.batch(operation, [pending.a for pending in group],
+                                                [pending.b for pending in group])
+                for pending, result in zip(group, results):
+                    pending.result = result
+            except Exception as e:
+                for pending in group:
+                    pending.error = e
+            finally:
+                for pending in group:
+                    pending.done.set()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Requests and batches executed so far, and the mean batch size."""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else None,
+        }
+
+    def close(self) -> None:
+        """Stop this process's dispatcher thread after it finishes queued requests."""
+        if self._pid == os.getpid() and self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._pid = None
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for request micro-batching.
+Serves the API with batching off and with several batch windows, drives it
+with load_test at a few concurrency levels, and reports throughput against
+latency for each setting.
+"""
+
+import argparse
+import json
+
+from api_simulator import create_app
+from live_server import LiveServer
+from load_test import run_load_test
+
+BATCH_MIX = {'add': 1.0, 'multiply': 1.0}
+
+
+def run_benchmarks(windows, concurrency, processes, duration, max_batch):
+    """Benchmark each window (None for batching off) at each client count; return result rows."""
+    rows = []
+    for window in windows:
+        for clients in concurrency:
+            config = {'BATCHING': False} if window is None else {
+                'BATCHING': True, 'BATCH_WINDOW_MS': window, 'BATCH_MAX_SIZE': max_batch}
+            app = create_app(config)
+            with LiveServer(app) as server:
+                report = run_load_test(server.url, BATCH_MIX, processes=processes,
+                                       threads=max(1, clients // processes), duration=duration)
+            batcher = app.extensions.get('batcher')
+            stats = batcher.stats() if batcher is not None else {}
+            if batcher is not None:
+                batcher.close()
+            rows.append({
+                'window_ms': window,
+                'clients': processes * max(1, clients // processes),
+                'requests': report['requests'],
+                'errors': report['errors'],
+                'throughput_rps': report['throughput_rps'],
+                'p50_ms': report['latency']['p50_ms'],
+                'p99_ms': report['latency']['p99_ms'],
+                'mean_batch_size': stats.get('mean_batch_size'),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark request micro-batching')
+    parser.add_argument('--windows', default='0.5,1,2',
+                        help='Comma-separated batch windows in milliseconds (default: 0.5,1,2)')
+    parser.add_argument('--concurrency', default='2,8,32',
+                        help='Comma-separated total client counts (default: 2,8,32)')
+    parser.add_argument('--processes', type=int, default=2, help='Client processes')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per run')
+    parser.add_argument('--max-batch', type=int, default=64, help='Maximum batch size')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        windows = [None] + [float(w) for w in args.windows.split(',') if w.strip()]
+        concurrency = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+
+    rows = run_benchmarks(windows, concurrency, args.processes, args.duration, args.max_batch)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'window':>8} {'clients':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'batch':>7}")
+    for row in rows:
+        window = 'off' if row['window_ms'] is None else f"{row['window_ms']:g}ms"
+        batch = '-' if row['mean_batch_size'] is None else f"{row['mean_batch_size']:.1f}"
+        print(f"{window:>8} {row['clients']:>8} {row['throughput_rps']:>10.0f} "
+              f"{row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {batch:>7}")
+
+
+if __name__ == '__main__':
+    main()
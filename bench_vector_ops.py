@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the vector operations module.
+Times each operation on both backends for inputs of 10^3 to 10^7 elements.
+"""
+
+import argparse
+import json
+import random
+import time
+
+import vector_ops
+from vector_ops import VectorCalculator
+
+
+# Largest matmul input (total elements per matrix) timed for each backend
+MATMUL_LIMITS = {'numpy': 10 ** 6, 'python': 10 ** 5}
+
+
+def best_time(func, *args, repeat=3):
+    """Return the best wall-clock time of several calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(min_exponent, max_exponent, repeat):
+    """Benchmark every operation and return a list of result rows."""
+    backends = [False, True] if vector_ops.HAS_NUMPY else [False]
+    rows = []
+    for exponent in range(min_exponent, max_exponent + 1):
+        size = 10 ** exponent
+        a = [random.random() for _ in range(size)]
+        b = [random.random() + 1.0 for _ in range(size)]
+        side = int(size ** 0.5)
+        matrix = [a[i * side:(i + 1) * side] for i in range(side)]
+
+        for use_numpy in backends:
+            calc = VectorCalculator(use_numpy=use_numpy)
+            # Convert once so only the operation itself is timed
+            x, y = calc._vector(a, 'a'), calc._vector(b, 'b')
+            cases = [
+                ('add', calc.add, (x, y)),
+                ('divide', calc.divide, (x, y)),
+                ('dot', calc.dot, (x, y)),
+                ('sum', calc.sum, (x,)),
+                ('mean', calc.mean, (x,)),
+            ]
+            if side * side <= MATMUL_LIMITS[calc.backend]:
+                m = calc._matrix(matrix, 'a')
+                cases.append(('matmul', calc.matmul, (m, m)))
+
+            for name, func, args in cases:
+                elapsed = best_time(func, *args, repeat=repeat)
+                calc.clear_history()
+                rows.append({
+                    'operation': name,
+                    'backend': calc.backend,
+                    'elements': side * side if name == 'matmul' else size,
+                    'seconds': elapsed,
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark vector operations')
+    parser.add_argument('--min-exponent', type=int, default=3, help='Smallest size as a power of ten')
+    parser.add_argument('--max-exponent', type=int, default=7, help='Largest size as a power of ten')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is reported)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    rows = run_benchmarks(args.min_exponent, args.max_exponent, args.repeat)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'operation':<10} {'backend':<8} {'elements':>10} {'seconds':>12} {'Melem/s':>10}")
+    for row in rows:
+        rate = row['elements'] / row['seconds'] / 1e6 if row['seconds'] else float('inf')
+        print(f"{row['operation']:<10} {row['backend']:<8} {row['elements']:>10} "
+              f"{row['seconds']:>12.6f} {rate:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark suite for the calculator module.
+Times Calculator methods and standalone functions, stores per-machine JSON
+baselines and flags operations that regress beyond a tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from calculator import Calculator, add, subtract, multiply, divide
+
+
+# Baselines are per machine, so they are not committed; CI agents keep them
+# outside the workspace by setting BENCH_BASELINE_DIR
+BASELINE_DIR = os.environ.get('BENCH_BASELINE_DIR', 'bench_baselines')
+
+# Exit status of --check when there is no baseline to compare against
+NO_BASELINE_EXIT = 2
+
+# Allowed slowdown of a tracked operation before it counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Large enough to be dominated by big-int work, small enough that the history
+# entry stays under the default int-to-str digit limit of Python 3.11+
+FACTORIAL_N = 1000
+AVERAGE_SIZE = 100000
+
+
+def _calculator_case(method: str, *args) -> Callable[[], Tuple[Callable, Callable]]:
+    """Benchmark case for a Calculator method; history is cleared between rounds."""
+    def setup():
+        calc = Calculator()
+        bound = getattr(calc, method)
+        return (lambda: bound(*args)), calc.clear_history
+    return setup
+
+
+def _function_case(func: Callable, *args) -> Callable[[], Tuple[Callable, Optional[Callable]]]:
+    """Benchmark case for a standalone function."""
+    def setup():
+        return (lambda: func(*args)), None
+    return setup
+
+
+# Benchmark name -> setup returning (timed callable, per-round reset or None)
+BENCHMARKS = {
+    'Calculator.add': _calculator_case('add', 123.5, 456.25),
+    'Calculator.subtract': _calculator_case('subtract', 123.5, 456.25),
+    'Calculator.multiply': _calculator_case('multiply', 123.5, 456.25),
+    'Calculator.divide': _calculator_case('divide', 123.5, 456.25),
+    'Calculator.power': _calculator_case('power', 1.5, 12),
+    'Calculator.square_root': _calculator_case('square_root', 12345.678),
+    'Calculator.factorial': _calculator_case('factorial', 20),
+    f'Calculator.factorial[n={FACTORIAL_N}]': _calculator_case('factorial', FACTORIAL_N),
+    'Calculator.average': _calculator_case('average', [1.5, 2.5, 3.5, 4.5]),
+    f'Calculator.average[n={AVERAGE_SIZE}]': _calculator_case(
+        'average', [i * 0.5 for i in range(AVERAGE_SIZE)]),
+    'add': _function_case(add, 123.5, 456.25),
+    'subtract': _function_case(subtract, 123.5, 456.25),
+    'multiply': _function_case(multiply, 123.5, 456.25),
+    'divide': _function_case(divide, 123.5, 456.25),
+}
+
+
+def measure(func: Callable, reset: Optional[Callable] = None, repeat: int = 7,
+            min_time: float = 0.05, warmup: float = 0.02) -> Dict[str, float]:
+    """
+    Time func and return per-call statistics in seconds.
+
+    The loop count is calibrated so that each of the `repeat` rounds takes
+    at least min_time, after warming up for about `warmup` seconds.
+    """
+    timer = time.perf_counter
+
+    end = timer() + warmup
+    while timer() < end:
+        func()
+    if reset:
+        reset()
+
+    loops = 1
+    while True:
+        start = timer()
+        for _ in range(loops):
+            func()
+        elapsed = timer() - start
+        if reset:
+            reset()
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = []
+    for _ in range(repeat):
+        start = timer()
+        for _ in range(loops):
+            func()
+        samples.append((timer() - start) / loops)
+        if reset:
+            reset()
+
+    return {
+        'loops': loops,
+        'rounds': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'max': max(samples),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, **options) -> Dict[str, Dict[str, float]]:
+    """Run the selected benchmarks (all by default) and return their statistics."""
+    results = {}
+    for name in names or BENCHMARKS:
+        func, reset = BENCHMARKS[name]()
+        results[name] = measure(func, reset, **options)
+    return results
+
+
+def machine_id() -> str:
+    """Identify this machine and interpreter for per-machine baselines."""
+    raw = '-'.join([
+        platform.node() or 'unknown',
+        platform.system(),
+        platform.machine(),
+        f"{platform.python_implementation()}{sys.version_info[0]}.{sys.version_info[1]}",
+    ])
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', raw)
+
+
+def baseline_path(directory: str = BASELINE_DIR) -> str:
+    """Path of this machine's baseline file."""
+    return os.path.join(directory, f"{machine_id()}.json")
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str) -> None:
+    """Write results as a baseline file."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'machine': machine_id(), 'python': platform.python_version(),
+                   'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """Load baseline results, or None when there is no baseline yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def find_regressions(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]],
+                     tolerance: float = DEFAULT_TOLERANCE, stat: str = 'min') -> List[Dict[str, float]]:
+    """
+    Compare current results with a baseline.
+
+    An operation regresses when its `stat` time exceeds the baseline by more
+    than `tolerance` (0.25 = 25% slower). The minimum is used by default as
+    it is the statistic least affected by scheduler noise.
+    """
+    regressions = []
+    for name, stats in current.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name][stat], stats[stat]
+        if old > 0 and new > old * (1 + tolerance):
+            regressions.append({'name': name, 'baseline': old, 'current': new,
+                                'slowdown': new / old - 1})
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, float]],
+                   baseline: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """Format results as a table, with change versus the baseline when given."""
+    lines = [f"{'benchmark':<36} {'min':>12} {'median':>12} {'stdev':>12} {'vs base':>9}"]
+    for name, stats in results.items():
+        change = ''
+        if baseline and name in baseline and baseline[name]['min'] > 0:
+            change = f"{100 * (stats['min'] / baseline[name]['min'] - 1):+.1f}%"
+        lines.append(f"{name:<36} {stats['min'] * 1e6:>10.3f}us {stats['median'] * 1e6:>10.3f}us "
+                     f"{stats['stdev'] * 1e6:>10.3f}us {change:>9}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run calculator microbenchmarks')
+    parser.add_argument('--check', action='store_true',
+                        help='Fail if an operation regressed against this machine\'s baseline')
+    parser.add_argument('--save', action='store_true', help='Save results as this machine\'s baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown before failing, as a fraction (default: 0.25)')
+    parser.add_argument('--baseline-dir', default=BASELINE_DIR, help='Directory holding baseline files')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=7, help='Timed rounds per benchmark')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    results = run_benchmarks(names, repeat=args.repeat)
+
+    path = baseline_path(args.baseline_dir)
+    baseline = load_baseline(path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(results, path)
+        print(f"\nBaseline saved to {path}")
+        return
+
+    if args.check:
+        if baseline is None:
+            print(f"\nNo baseline for this machine at {path}; nothing to compare against. "
+                  f"Record one with --save first.")
+            sys.exit(NO_BASELINE_EXIT)
+        regressions = find_regressions(baseline, results, args.tolerance)
+        if regressions:
+            print(f"\nPerformance regressions (tolerance {args.tolerance:.0%}):")
+            for item in regressions:
+                print(f"  {item['name']}: {item['baseline'] * 1e6:.3f}us -> "
+                      f"{item['current'] * 1e6:.3f}us (+{item['slowdown']:.0%})")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,88 +4,153 @@ Provides basic arithmetic operations and some advanced mathematical functions.
 """
 
 import math
-from typing import Union, List
+import operator
+from typing import Any, Dict, Union, List, Optional
 import logging
 
-# Add to your API and calculator modules
-logging.basicConfig(level=logging.INFO)
+from history_index import HistoryIndex
+
+# Logging is configured by the application entry point (see api_simulator.py),
+# not at import time, so importing this module stays cheap and side-effect free
 logger = logging.getLogger(__name__)
 
 # Log all API requests, errors, calculations
 
+# Binary operations that can run over a batch of operand pairs: symbol and function
+BATCH_OPERATIONS = {
+    'add': ('+', operator.add),
+    'subtract': ('-', operator.sub),
+    'multiply': ('*', operator.mul),
+}
+
 class Calculator:
     """A simple calculator class with basic and advanced mathematical operations."""
     
-    def __init__(self):
-        self.history = []
+    def __init__(self, history: Optional[List[str]] = None, index: Optional[HistoryIndex] = None):
+        # Any list-like store works, e.g. a SharedHistory shared by worker processes
+        self.history = history if history is not None else []
+        # Optional index of results and failures for history queries
+        self.index = index
+    
+    def _record(self, operation: str, entry: str, result) -> None:
+        """Add a calculation to the history and the index."""
+        self.history.append(entry)
+        if self.index is not None:
+            self.index.record(operation, result, entry=entry)
+    
+    def _failure(self, operation: str, message: str) -> ValueError:
+        """Index a failed calculation and return the error to raise."""
+        if self.index is not None:
+            self.index.record(operation, error=message)
+        return ValueError(message)
     
     def add(self, a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
         """Add two numbers."""
         result = a + b
-        self.history.append(f"{a} + {b} = {result}")
+        self._record('add', f"{a} + {b} = {result}", result)
         return result
     
     def subtract(self, a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
         """Subtract b from a."""
         result = a - b
-        self.history.append(f"{a} - {b} = {result}")
+        self._record('subtract', f"{a} - {b} = {result}", result)
         return result
     
     def multiply(self, a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
         """Multiply two numbers."""
         result = a * b
-        self.history.append(f"{a} * {b} = {result}")
+        self._record('multiply', f"{a} * {b} = {result}", result)
         return result
     
     def divide(self, a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
         """Divide a by b."""
         if b == 0:
-            raise ValueError("Cannot divide by zero")
+            raise self._failure('divide', "Cannot divide by zero")
         result = a / b
-        self.history.append(f"{a} / {b} = {result}")
+        self._record('divide', f"{a} / {b} = {result}", result)
         return result
     
     def power(self, base: Union[int, float], exponent: Union[int, float]) -> Union[int, float]:
         """Raise base to the power of exponent."""
         result = base ** exponent
-        self.history.append(f"{base} ^ {exponent} = {result}")
+        self._record('power', f"{base} ^ {exponent} = {result}", result)
         return result
     
     def square_root(self, number: Union[int, float]) -> float:
         """Calculate the square root of a number."""
         if number < 0:
-            raise ValueError("Cannot calculate square root of negative number")
+            raise self._failure('square_root', "Cannot calculate square root of negative number")
         result = math.sqrt(number)
-        self.history.append(f"√{number} = {result}")
+        self._record('square_root', f"√{number} = {result}", result)
         return result
     
     def factorial(self, n: int) -> int:
         """Calculate the factorial of a non-negative integer."""
         if n < 0:
-            raise ValueError("Factorial is not defined for negative numbers")
+            raise self._failure('factorial', "Factorial is not defined for negative numbers")
         if n == 0 or n == 1:
             return 1
         result = 1
         for i in range(2, n + 1):
             result *= i
-        self.history.append(f"{n}! = {result}")
+        self._record('factorial', f"{n}! = {result}", result)
         return result
     
     def average(self, numbers: List[Union[int, float]]) -> float:
         """Calculate the average of a list of numbers."""
         if not numbers:
-            raise ValueError("Cannot calculate average of empty list")
+            raise self._failure('average', "Cannot calculate average of empty list")
         result = sum(numbers) / len(numbers)
-        self.history.append(f"Average of {numbers} = {result}")
+        self._record('average', f"Average of {numbers} = {result}", result)
         return result
     
+    def batch(self, operation: str, a_values: List[Union[int, float]],
+              b_values: List[Union[int, float]]) -> List[Union[int, float]]:
+        """
+        Apply a binary operation to pairs of operands in one pass.
+        
+        Each pair is recorded as its own calculation, exactly as if the
+        single-pair method had been called once per pair.
+        """
+        if operation not in BATCH_OPERATIONS:
+            raise ValueError(f"Operation cannot be batched: {operation}")
+        if len(a_values) != len(b_values):
+            raise ValueError("Operand lists must have the same length")
+        symbol, func = BATCH_OPERATIONS[operation]
+        results = list(map(func, a_values, b_values))
+        for a, b, result in zip(a_values, b_values, results):
+            self._record(operation, f"{a} {symbol} {b} = {result}", result)
+        return results
+    
     def clear_history(self):
         """Clear the calculation history."""
         self.history.clear()
+        if self.index is not None:
+            self.index.clear()
     
     def get_history(self) -> List[str]:
         """Get the calculation history."""
         return self.history.copy()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the history and index so restore() can return to this state."""
+        return {
+            'history': self.history.copy(),
+            'index': self.index.snapshot() if self.index is not None else None,
+        }
+    
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Return to a snapshot taken with snapshot().
+        
+        The history is refilled in place, so calculators sharing it (such as
+        the API's VectorCalculator) see the restored entries too.
+        """
+        self.history.clear()
+        for entry in snapshot['history']:
+            self.history.append(entry)
+        if self.index is not None:
+            self.index.restore(snapshot['index'] or [])
 
 
 # Standalone functions for convenience
@@ -0,0 +1,173 @@
+"""
+HTTP Compression Module
+Negotiates gzip/deflate response compression from Accept-Encoding and
+decompresses gzip/deflate request bodies for a Flask app.
+"""
+
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Optional
+import logging
+
+from flask import Flask, Response, current_app, request
+from werkzeug.wsgi import get_input_stream
+
+logger = logging.getLogger(__name__)
+
+# zlib window bits for each supported content coding
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+DEFAULT_CONFIG = {
+    'COMPRESS_ENABLED': True,
+    # Responses smaller than this many bytes are sent uncompressed
+    'COMPRESS_MIN_SIZE': 1024,
+    # zlib compression level, 1 (fastest) to 9 (smallest)
+    'COMPRESS_LEVEL': 6,
+    'COMPRESS_MIMETYPES': ['application/json', 'text/html', 'text/plain', 'text/csv'],
+    # Upper bound on a decompressed request body, guards against zip bombs
+    'COMPRESS_MAX_REQUEST_SIZE': 64 * 1024 * 1024,
+}
+
+
+class DecompressedSizeError(ValueError):
+    """Raised when a compressed request body expands beyond the allowed size."""
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Pick the best supported encoding from a parsed Accept-Encoding header."""
+    return accept_encodings.best_match(list(ENCODINGS))
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compress a complete body with the given content coding."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    """
+    Compress a chunked body incrementally, yielding compressed chunks.
+
+    Each input chunk is sync-flushed so the client can decode it as soon as
+    it arrives, instead of zlib buffering the body until the end.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if not chunk:
+                continue
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def decompress(data: bytes, encoding: str, max_size: int) -> bytes:
+    """Decompress a request body, refusing to expand it beyond max_size bytes."""
+    decompressor = zlib.decompressobj(ENCODINGS[encoding])
+    try:
+        result = decompressor.decompress(data, max_size + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid {encoding} request body: {e}")
+    if len(result) > max_size or decompressor.unconsumed_tail:
+        raise DecompressedSizeError(f"Decompressed request body exceeds {max_size} bytes")
+    if not decompressor.eof:
+        raise ValueError(f"Invalid {encoding} request body: truncated data")
+    return result
+
+
+def _error_response(message: str, status: int) -> Response:
+    """Build a JSON error response outside of a Flask request context."""
+    return Response(json.dumps({'error': message}), status=status, mimetype='application/json')
+
+
+class RequestDecompressionMiddleware:
+    """WSGI middleware that transparently decompresses gzip/deflate request bodies."""
+
+    def __init__(self, app: Flask, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding in ('', 'identity'):
+            return self.wsgi_app(environ, start_response)
+        if encoding not in ENCODINGS:
+            response = _error_response(f'Unsupported Content-Encoding: {encoding}', 415)
+            return response(environ, start_response)
+
+        max_size = self.app.config['COMPRESS_MAX_REQUEST_SIZE']
+        # The compressed body is read into memory, so cap it before reading
+        max_compressed = self.app.config.get('MAX_CONTENT_LENGTH') or max_size
+        too_large = _error_response(f"Compressed request body exceeds {max_compressed} bytes", 413)
+        try:
+            declared = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_compressed:
+            return too_large(environ, start_response)
+        data = get_input_stream(environ).read(max_compressed + 1)
+        if len(data) > max_compressed:
+            return too_large(environ, start_response)
+
+        try:
+            body = decompress(data, encoding, max_size)
+        except DecompressedSizeError as e:
+            return _error_response(str(e), 413)(environ, start_response)
+        except ValueError as e:
+            return _error_response(str(e), 400)(environ, start_response)
+
+        environ = dict(environ)
+        environ.pop('HTTP_CONTENT_ENCODING')
+        environ.pop('HTTP_TRANSFER_ENCODING', None)
+        environ['CONTENT_LENGTH'] = str(len(body))
+        environ['wsgi.input'] = io.BytesIO(body)
+        return self.wsgi_app(environ, start_response)
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook that compresses eligible responses."""
+    config = current_app.config
+    if not config['COMPRESS_ENABLED']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    level = config['COMPRESS_LEVEL']
+    if response.is_streamed:
+        # Size is unknown up front, so chunked bodies are always compressed
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress(data, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app: Flask) -> Flask:
+    """Enable request decompression and negotiated response compression on an app."""
+    for key, value in DEFAULT_CONFIG.items():
+        app.config.setdefault(key, value)
+    app.wsgi_app = RequestDecompressionMiddleware(app, app.wsgi_app)
+    app.after_request(compress_response)
+    return app
@@ -0,0 +1,90 @@
+"""
+Shared pytest fixtures.
+"""
+
+import os
+
+import pytest
+
+from live_server import LiveServer, make_session
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true',
+                     help='Also run tests marked slow, such as wall-clock budget checks')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --run-slow is given; they are timing-sensitive on busy machines."""
+    if config.getoption('--run-slow'):
+        return
+    skip_slow = pytest.mark.skip(reason='Slow test; use --run-slow to run it')
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope='session')
+def api_app():
+    """
+    The API app shared by all tests of this session.
+
+    Built once per process, so every pytest process of a --workers run or
+    a shard gets its own app. The in-memory history backend is forced so a
+    HISTORY_BACKEND set in the environment cannot share state across them.
+    """
+    from api_simulator import create_app
+
+    return create_app({'TESTING': True, 'HISTORY_BACKEND': 'memory'})
+
+
+@pytest.fixture(scope='session')
+def api_baseline(api_app):
+    """Calculator state of the freshly built app."""
+    return api_app.extensions['calculator'].snapshot()
+
+
+@pytest.fixture(scope='session')
+def api_client(api_app):
+    """Test client of the session's app, reused by every test."""
+    with api_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def client(api_client, api_app, api_baseline):
+    """The session's test client, with the Calculator restored to its initial state."""
+    api_app.extensions['calculator'].restore(api_baseline)
+    return api_client
+
+
+@pytest.fixture(scope='session')
+def live_server():
+    """
+    Serve the API from a background thread on an ephemeral port for the whole session.
+
+    Uses its own app, so its history is separate from the test client's.
+    """
+    from api_simulator import create_app
+
+    with LiveServer(create_app()) as server:
+        yield server
+
+
+@pytest.fixture(scope='session')
+def api_url(request):
+    """
+    Base URL for API testing.
+
+    Uses the API_URL environment variable when set (an externally started
+    server), otherwise the session's live server.
+    """
+    return os.environ.get('API_URL') or request.getfixturevalue('live_server').url
+
+
+@pytest.fixture(scope='session')
+def api_session():
+    """Pooled keep-alive HTTP session shared by integration tests."""
+    session = make_session()
+    yield session
+    session.close()
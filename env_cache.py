@@ -0,0 +1,204 @@
+"""
+Environment Cache Module
+Keeps content-addressed virtual environments and wheel caches keyed on
+requirements.txt and the interpreter, so test runs reuse an existing
+environment instead of reinstalling dependencies.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# Override with the VENV_CACHE_DIR environment variable, e.g. on CI agents
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'automated-testing-pipeline')
+
+# Written into an environment once it is fully built
+COMPLETE_MARKER = '.env-complete.json'
+
+# Superseded builds are kept this long so jobs still using them keep working
+STALE_BUILD_SECONDS = 24 * 60 * 60
+
+
+def cache_dir() -> str:
+    """Root directory of the environment and wheel caches."""
+    return os.environ.get('VENV_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def interpreter_tag() -> str:
+    """Describe the running interpreter; environments are not shared across these."""
+    return '-'.join([
+        sys.implementation.name,
+        '.'.join(str(part) for part in sys.version_info[:3]),
+        sys.platform,
+        platform.machine(),
+    ])
+
+
+def environment_key(requirements: str = 'requirements.txt') -> str:
+    """Hash of the requirements file contents and the interpreter."""
+    digest = hashlib.sha256()
+    with open(requirements, 'rb') as f:
+        digest.update(f.read())
+    digest.update(b'\0' + interpreter_tag().encode())
+    return digest.hexdigest()[:16]
+
+
+def _run(command, description):
+    """Run a setup command, printing its output only when it fails."""
+    print(f"{description}...")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout)
+        print(result.stderr)
+        raise RuntimeError(f"{description} failed")
+
+
+def _link(target: str, link: str) -> None:
+    """Point `link` at `target`, moving an unmanaged venv aside rather than deleting it."""
+    if os.path.islink(link):
+        if os.readlink(link) == target:
+            return
+        os.remove(link)
+    elif os.path.isdir(link):
+        # May be a hand-built environment, so keep it for the developer to remove
+        aside = f"{link}.unmanaged-{int(time.time())}"
+        os.rename(link, aside)
+        print(f"Moved unmanaged {link}/ to {aside}/; delete it once it is no longer needed")
+    os.symlink(target, link)
+
+
+@contextmanager
+def _key_lock(root: str, key: str) -> Iterator[None]:
+    """Hold an exclusive lock on one cache key, shared by all builds on this machine."""
+    lock_dir = os.path.join(root, 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    with open(os.path.join(lock_dir, f"{key}.lock"), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _replace_link(target: str, link: str) -> None:
+    """Atomically point `link` at `target`."""
+    if os.path.isdir(link) and not os.path.islink(link):
+        # Environment built in place by an older version; retire it like a build
+        os.rename(link, f"{link}-{int(time.time())}")
+    temporary = f"{link}.{os.getpid()}.tmp"
+    os.symlink(target, temporary)
+    os.replace(temporary, link)
+
+
+def prune_builds(venv_root: str, key: str, keep: str, max_age: float = STALE_BUILD_SECONDS) -> None:
+    """Remove superseded builds of a key that are older than max_age seconds."""
+    cutoff = time.time() - max_age
+    for name in os.listdir(venv_root):
+        path = os.path.join(venv_root, name)
+        if (name.startswith(f"{key}-") and path != keep and not os.path.islink(path)
+                and os.path.getmtime(path) < cutoff):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build_wheels(requirements: str, wheel_dir: str, python: str) -> None:
+    """
+    Download and build wheels for every requirement into wheel_dir.
+
+    Wheels are built in a sibling directory and moved into place once
+    complete, so a failed build never leaves a partial cache behind.
+    """
+    parent = os.path.dirname(wheel_dir)
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(wheel_dir)}-", dir=parent)
+    try:
+        _run([python, '-m', 'pip', 'wheel', '-q', '-r', requirements, '-w', build_dir],
+             'Building wheel cache')
+        with open(os.path.join(build_dir, COMPLETE_MARKER), 'w') as f:
+            json.dump({'requirements': os.path.abspath(requirements)}, f)
+        shutil.rmtree(wheel_dir, ignore_errors=True)
+        os.replace(build_dir, wheel_dir)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+
+def ensure_environment(requirements: str = 'requirements.txt', link: str = 'venv',
+                       rebuild: bool = False, root: Optional[str] = None) -> str:
+    """
+    Return a virtual environment with the requirements installed.
+
+    Each build lives in its own <cache>/venvs/<key>-<suffix> directory and
+    <cache>/venvs/<key> is a symlink to the current one, swapped atomically
+    once a build completes. `link` points at the build itself, so a rebuild
+    never pulls an environment out from under a job that is using it.
+    Builds of the same key are serialised by a per-key lock, so concurrent
+    jobs wait for one build instead of racing. Wheels are cached in
+    <cache>/wheels/<key>, so `rebuild` recreates the environment from them
+    without network access.
+    """
+    root = root or cache_dir()
+    key = environment_key(requirements)
+    venv_root = os.path.join(root, 'venvs')
+    current = os.path.join(venv_root, key)
+    wheel_dir = os.path.join(root, 'wheels', key)
+    os.makedirs(venv_root, exist_ok=True)
+
+    with _key_lock(root, key):
+        if not rebuild and os.path.exists(os.path.join(current, COMPLETE_MARKER)):
+            print(f"Reusing cached environment {key}")
+            env_dir = os.readlink(current) if os.path.islink(current) else current
+            _link(env_dir, link)
+            return env_dir
+
+        env_dir = tempfile.mkdtemp(prefix=f"{key}-", dir=venv_root)
+        print(f"Building environment {key} in {env_dir}")
+        try:
+            # The venv is created at its final path since it embeds that path
+            _run([sys.executable, '-m', 'venv', env_dir], 'Creating virtual environment')
+            python = os.path.join(env_dir, 'bin', 'python')
+            if not os.path.exists(os.path.join(wheel_dir, COMPLETE_MARKER)):
+                build_wheels(requirements, wheel_dir, python)
+            _run([python, '-m', 'pip', 'install', '-q', '--no-index', '--find-links', wheel_dir,
+                  '-r', requirements], 'Installing dependencies from wheel cache')
+
+            with open(os.path.join(env_dir, COMPLETE_MARKER), 'w') as f:
+                json.dump({'key': key, 'interpreter': interpreter_tag(),
+                           'requirements': os.path.abspath(requirements)}, f, indent=2)
+        except BaseException:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            raise
+        _replace_link(env_dir, current)
+        prune_builds(venv_root, key, keep=env_dir)
+
+    _link(env_dir, link)
+    return env_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create or reuse the cached test environment')
+    parser.add_argument('--requirements', default='requirements.txt', help='Requirements file')
+    parser.add_argument('--rebuild', action='store_true', help='Recreate the environment from the wheel cache')
+
+    args = parser.parse_args()
+
+    try:
+        ensure_environment(args.requirements, rebuild=args.rebuild)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
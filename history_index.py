@@ -0,0 +1,316 @@
+"""
+History Index Module
+Keeps calculation records indexed by operation and time bucket, with running
+aggregates, so history can be queried and summarised without scanning it.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+DEFAULT_BUCKET_SECONDS = 60
+
+STATUSES = ('ok', 'error')
+
+
+class Aggregate:
+    """Running count, error count, sum, min and max of operation results."""
+
+    __slots__ = ('count', 'errors', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, result: Optional[float]) -> None:
+        """Add one result, or one failure when result is None."""
+        if result is None:
+            self.errors += 1
+            return
+        self.count += 1
+        self.total += result
+        if result < self.minimum:
+            self.minimum = result
+        if result > self.maximum:
+            self.maximum = result
+
+    def merge(self, other: 'Aggregate') -> None:
+        """Add another aggregate's values to this one."""
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_dict(self) -> Dict:
+        """Aggregate values; mean, min and max are None when nothing succeeded."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+        }
+
+
+def _as_float(result) -> Optional[float]:
+    """
+    Convert a result for indexing.
+
+    Integers too large for a float become inf; non-real results (such as
+    complex powers) become None and are left out of aggregates.
+    """
+    try:
+        return float(result)
+    except OverflowError:
+        return math.inf if result > 0 else -math.inf
+    except TypeError:
+        return None
+
+
+class HistoryIndex:
+    """
+    Calculation records indexed by operation and by time bucket.
+
+    Records are appended in time order. Each operation keeps the positions
+    and timestamps of its records for range lookups by bisection, plus a
+    running aggregate. Every time bucket keeps one aggregate per operation,
+    so aggregates over a time range merge whole buckets and scan only the
+    records in the two partial buckets at its edges. Aggregates therefore
+    cost time proportional to the buckets in range, not to history size;
+    filtering on the result value falls back to scanning matching records.
+
+    With a capacity, only the most recent `capacity` records are kept, like
+    the fixed-size history they index. Evicted records are dropped from
+    queries at once and compacted away once as many have built up.
+
+    All methods are safe to call from several threads; one lock serialises
+    updates with each other and with reads.
+    """
+
+    def __init__(self, bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+                 clock: Callable[[], float] = time.time, capacity: Optional[int] = None):
+        if bucket_seconds <= 0:
+            raise ValueError("Bucket width must be positive")
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self.capacity = capacity
+        # Reentrant, since aggregate() and restore() call other locked methods
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all records and aggregates."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self, base: int = 0) -> None:
+        # records[i] has id base + i; ids below _first have been evicted
+        self.records = []
+        self._base = base
+        self._first = base
+        self._times = []
+        self._op_positions = {}
+        self._op_times = {}
+        self._totals = {}
+        self._buckets = {}
+        self._bucket_keys = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._base + len(self.records) - self._first
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def record(self, op: str, result=None, error: Optional[str] = None,
+               entry: Optional[str] = None) -> Dict:
+        """Record a successful result, or a failure when error is given."""
+        value = None if error is not None else _as_float(result)
+        with self._lock:
+            timestamp = self.clock()
+            if self._times and timestamp < self._times[-1]:
+                # Keep records sorted if the wall clock steps backwards
+                timestamp = self._times[-1]
+            # The id follows from the record's position, so it is taken under the lock
+            record = {'id': self._base + len(self.records), 'op': op, 'timestamp': timestamp,
+                      'status': 'error' if error is not None else 'ok',
+                      'result': value, 'error': error, 'entry': entry}
+            self._insert(record)
+        return record
+
+    def _insert(self, record: Dict) -> None:
+        """Append a record and update the indexes and aggregates; hold the lock."""
+        op, timestamp, value = record['op'], record['timestamp'], record['result']
+        self.records.append(record)
+        self._times.append(timestamp)
+        self._op_positions.setdefault(op, []).append(record['id'])
+        self._op_times.setdefault(op, []).append(timestamp)
+        key = self._bucket(timestamp)
+        if key not in self._buckets:
+            self._buckets[key] = {}
+            self._bucket_keys.append(key)
+        if record['status'] == 'error' or value is not None:
+            self._totals.setdefault(op, Aggregate()).add(value)
+            self._buckets[key].setdefault(op, Aggregate()).add(value)
+        if self.capacity is not None and len(self) > self.capacity:
+            self._first += 1
+            if self._first - self._base >= self.capacity:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Drop evicted records and rebuild the indexes and aggregates from the rest."""
+        kept = self.records[self._first - self._base:]
+        self._reset(self._first)
+        for record in kept:
+            self._insert(record)
+
+    def _get(self, position: int) -> Dict:
+        return self.records[position - self._base]
+
+    def _time(self, position: int) -> float:
+        return self._times[position - self._base]
+
+    def snapshot(self) -> List[Dict]:
+        """Capture the current records so restore() can return to them."""
+        with self._lock:
+            return self.records[self._first - self._base:]
+
+    def restore(self, records: List[Dict]) -> None:
+        """Replace the contents with a snapshot, rebuilding the indexes from it."""
+        with self._lock:
+            self._reset(records[0]['id'] if records else 0)
+            for record in records:
+                self._insert(record)
+
+    def operations(self) -> List[str]:
+        """Operations that have records."""
+        with self._lock:
+            return sorted(self._op_positions)
+
+    def _positions(self, op: Optional[str], start: Optional[float], end: Optional[float],
+                   newest_first: bool = False) -> Iterator[int]:
+        """Lazily yield record ids for op (or all ops) with start <= timestamp < end."""
+        if op is None:
+            positions, times = None, self._times
+            low = self._first - self._base
+        else:
+            positions, times = self._op_positions.get(op, []), self._op_times.get(op, [])
+            low = bisect.bisect_left(positions, self._first)
+        if start is not None:
+            low = max(low, bisect.bisect_left(times, start))
+        high = len(times) if end is None else bisect.bisect_left(times, end)
+        indexes = range(high - 1, low - 1, -1) if newest_first else range(low, high)
+        for index in indexes:
+            yield index + self._base if positions is None else positions[index]
+
+    def query(self, op: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None, min_result: Optional[float] = None,
+              max_result: Optional[float] = None, status: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Records matching every given filter, oldest first.
+
+        The time range includes start and excludes end; the result range is
+        inclusive and only matches successful records. With a limit, the
+        most recent matching records are returned.
+        """
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        with self._lock:
+            result_filter = min_result is not None or max_result is not None
+            matches = []
+            for position in self._positions(op, start, end, newest_first=True):
+                record = self._get(position)
+                if status is not None and record['status'] != status:
+                    continue
+                if result_filter:
+                    value = record['result']
+                    if value is None or (min_result is not None and value < min_result) \
+                            or (max_result is not None and value > max_result):
+                        continue
+                matches.append(record)
+                if limit is not None and len(matches) >= limit:
+                    break
+        matches.reverse()
+        return matches
+
+    @staticmethod
+    def _add_record(aggregate: Aggregate, record: Dict) -> None:
+        """Add a record to an aggregate the same way record() does."""
+        if record['status'] == 'error' or record['result'] is not None:
+            aggregate.add(record['result'])
+
+    def _merge_ops(self, aggregates: Dict[str, Aggregate], op: Optional[str],
+                   into: Aggregate) -> None:
+        """Merge one operation's aggregate, or all of them, into `into`."""
+        if op is None:
+            for aggregate in aggregates.values():
+                into.merge(aggregate)
+        elif op in aggregates:
+            into.merge(aggregates[op])
+
+    def aggregate(self, op: Optional[str] = None, start: Optional[float] = None,
+                  end: Optional[float] = None, min_result: Optional[float] = None,
+                  max_result: Optional[float] = None) -> Dict:
+        """Count, errors, sum, mean, min and max of the records matching the filters."""
+        with self._lock:
+            return self._aggregate(op, start, end, min_result, max_result)
+
+    def _aggregate(self, op: Optional[str], start: Optional[float], end: Optional[float],
+                   min_result: Optional[float], max_result: Optional[float]) -> Dict:
+        result = Aggregate()
+        if min_result is not None or max_result is not None:
+            for record in self.query(op, start, end, min_result, max_result):
+                self._add_record(result, record)
+            return result.to_dict()
+
+        if self._first > self._base:
+            # Evicted records still count in the totals and in buckets up to
+            # the oldest kept record's, so start the range at that record
+            # and let its bucket be scanned as an edge
+            oldest = self._times[self._first - self._base]
+            if start is None or start < oldest:
+                start = oldest
+
+        if start is None and end is None:
+            self._merge_ops(self._totals, op, result)
+            return result.to_dict()
+
+        first = None if start is None else self._bucket(start)
+        last = None if end is None else self._bucket(end)
+        if first is not None and first == last:
+            for position in self._positions(op, start, end):
+                self._add_record(result, self._get(position))
+            return result.to_dict()
+
+        # Whole buckets strictly between the edge buckets
+        low = 0 if first is None else bisect.bisect_right(self._bucket_keys, first)
+        high = len(self._bucket_keys)
+        if last is not None:
+            high = bisect.bisect_left(self._bucket_keys, last)
+        for key in self._bucket_keys[low:high]:
+            self._merge_ops(self._buckets[key], op, result)
+        # Records in the partial buckets at either edge
+        edge = []
+        if first is not None:
+            for position in self._positions(op, start, end):
+                if self._bucket(self._time(position)) != first:
+                    break
+                edge.append(position)
+        if last is not None:
+            for position in self._positions(op, start, end, newest_first=True):
+                if self._bucket(self._time(position)) != last:
+                    break
+                edge.append(position)
+        for position in edge:
+            self._add_record(result, self._get(position))
+        return result.to_dict()
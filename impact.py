@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test Impact Analysis Module
+Records which tests execute each source line (coverage contexts) into a
+compact index, then selects only the tests affected by changed lines.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Set
+
+INDEX_FILE = '.test_impact.json'
+INDEX_VERSION = 1
+COVERAGE_DATA = '.coverage.impact'
+
+# Selecting "all tests" is reported with this sentinel instead of node ids
+ALL_TESTS = None
+
+# Changes to these files can affect any test
+CONFIG_FILES = ['pytest.ini', 'setup.cfg', 'tox.ini', 'pyproject.toml', 'requirements.txt']
+
+HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+')
+
+
+def _git(*args: str) -> str:
+    """Run a git command and return its output."""
+    result = subprocess.run(['git', *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def python_files() -> List[str]:
+    """Tracked and untracked (but not ignored) Python files in the repository."""
+    output = _git('ls-files', '--cached', '--others', '--exclude-standard', '--', '*.py')
+    return sorted({path for path in output.splitlines() if os.path.exists(path)})
+
+
+def config_files() -> List[str]:
+    """Configuration files present in the working tree."""
+    return [path for path in CONFIG_FILES if os.path.exists(path)]
+
+
+def store_blob(path: str) -> str:
+    """Store a file's current content in the git object database; return its id."""
+    return _git('hash-object', '-w', '--', path).strip()
+
+
+def blob_exists(blob: str) -> bool:
+    """Whether a blob id is still present in the object database."""
+    return subprocess.run(['git', 'cat-file', '-e', blob], capture_output=True).returncode == 0
+
+
+def changed_lines(old_blob: str, new_blob: str) -> Set[int]:
+    """
+    Line numbers of the old version touched by the change from old_blob to new_blob.
+
+    Pure insertions are attributed to the lines on either side of them.
+    """
+    lines = set()
+    for line in _git('diff', '-U0', old_blob, new_blob).splitlines():
+        match = HUNK_RE.match(line)
+        if not match:
+            continue
+        start, count = int(match.group(1)), int(match.group(2) or 1)
+        if count == 0:
+            lines.update((start, start + 1))
+        else:
+            lines.update(range(start, start + count))
+    return lines
+
+
+def is_test_file(path: str) -> bool:
+    """Whether a path is a pytest test module."""
+    return os.path.basename(path).startswith('test_') and path.endswith('.py')
+
+
+def build_index(data_file: str = COVERAGE_DATA) -> Dict:
+    """
+    Build the impact index from coverage data recorded with test contexts.
+
+    Maps every measured file's line numbers to the tests that executed them,
+    and stores a git blob id per Python file so changes can be diffed later.
+    """
+    import coverage
+
+    data = coverage.CoverageData(basename=data_file)
+    data.read()
+
+    tests = []
+    test_ids = {}
+    files = {}
+    for filename in data.measured_files():
+        path = os.path.relpath(filename)
+        if path.startswith('..'):
+            continue
+        lines = {}
+        for lineno, contexts in sorted(data.contexts_by_lineno(filename).items()):
+            ids = set()
+            for context in contexts:
+                node_id = context.split('|')[0]
+                if not node_id:
+                    continue
+                if node_id not in test_ids:
+                    test_ids[node_id] = len(tests)
+                    tests.append(node_id)
+                ids.add(test_ids[node_id])
+            lines[str(lineno)] = sorted(ids)
+        files[path] = lines
+
+    return {
+        'version': INDEX_VERSION,
+        'tests': tests,
+        'coverage': files,
+        'blobs': {path: store_blob(path) for path in python_files()},
+        'config': {path: store_blob(path) for path in config_files()},
+    }
+
+
+def record(pytest_args: Sequence[str] = ('-m', 'not integration'), index_file: str = INDEX_FILE,
+           python: str = sys.executable) -> bool:
+    """Run the suite with per-test coverage contexts and write the index."""
+    env = dict(os.environ, COVERAGE_FILE=COVERAGE_DATA)
+    command = [python, '-m', 'pytest', '-q', '--cov=.', '--cov-context=test', '--cov-report=',
+               *pytest_args]
+    if subprocess.run(command, env=env).returncode != 0:
+        print("Tests failed; impact index not updated")
+        return False
+    index = build_index(COVERAGE_DATA)
+    with open(index_file, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.remove(COVERAGE_DATA)
+    print(f"Recorded impact index for {len(index['tests'])} tests in {index_file}")
+    return True
+
+
+def load_index(index_file: str = INDEX_FILE) -> Optional[Dict]:
+    """Load the index, or None if it is missing or from another version."""
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get('version') == INDEX_VERSION else None
+
+
+def select_tests(index: Optional[Dict]) -> Optional[List[str]]:
+    """
+    Return the tests affected by changes since the index was recorded.
+
+    Returns ALL_TESTS (None) when the index cannot be trusted: it is missing,
+    a recorded blob is gone, configuration changed, or a changed or deleted
+    module is not covered by the index. Changed test files are run in full.
+    """
+    if index is None:
+        return ALL_TESTS
+    if {path: store_blob(path) for path in config_files()} != index['config']:
+        return ALL_TESTS
+
+    tests = index['tests']
+    blobs = index['blobs']
+    selected = set()
+    extra_files = set()
+    current = python_files()
+    if any(not is_test_file(path) for path in set(blobs) - set(current)):
+        return ALL_TESTS
+
+    for path in current:
+        old_blob = blobs.get(path)
+        if old_blob is None:
+            if is_test_file(path):
+                extra_files.add(path)
+                continue
+            # An untested new module could be imported anywhere
+            return ALL_TESTS
+        new_blob = store_blob(path)
+        if new_blob == old_blob:
+            continue
+        if is_test_file(path):
+            extra_files.add(path)
+            continue
+        if path not in index['coverage'] or not blob_exists(old_blob):
+            return ALL_TESTS
+
+        coverage = index['coverage'][path]
+        touching = {test for ids in coverage.values() for test in ids}
+        for lineno in changed_lines(old_blob, new_blob):
+            ids = coverage.get(str(lineno))
+            # Lines run only at import time, or never, may affect any test using the file
+            selected.update(ids if ids else touching)
+
+    # Tests of changed or deleted test files are covered by extra_files
+    selected_ids = {tests[i] for i in selected
+                    if tests[i].split('::')[0] not in extra_files and tests[i].split('::')[0] in current}
+    return sorted(selected_ids) + sorted(extra_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coverage-based test impact analysis')
+    parser.add_argument('command', choices=['record', 'select', 'run'],
+                        help='record the index, list affected tests, or run them')
+    parser.add_argument('--index', default=INDEX_FILE, help='Impact index file')
+
+    args, pytest_args = parser.parse_known_args()
+
+    if args.command == 'record':
+        sys.exit(0 if record(pytest_args or ('-m', 'not integration'), args.index) else 1)
+
+    selection = select_tests(load_index(args.index))
+    if args.command == 'select':
+        print('\n'.join(['ALL'] if selection is ALL_TESTS else selection))
+        return
+
+    if selection is ALL_TESTS:
+        print("Impact index missing or stale; running the full suite")
+        targets = list(pytest_args) or ['-m', 'not integration']
+    elif not selection:
+        print("No tests affected by the current changes")
+        return
+    else:
+        print(f"Running {len(selection)} affected test(s)")
+        targets = [*pytest_args, *selection]
+    sys.exit(subprocess.run([sys.executable, '-m', 'pytest', *targets]).returncode)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Import-time profiler.
+Measures cold-start import cost of project modules in fresh interpreters
+using `python -X importtime`, reports the most expensive imports and checks
+totals against per-module budgets.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Cold-start import budgets in milliseconds. Flask dominates api_simulator;
+# scale all budgets on slow machines with IMPORT_BUDGET_SCALE (e.g. 2.0).
+IMPORT_BUDGETS_MS = {
+    'calculator': 30,
+    'vector_ops': 30,
+    'api_simulator': 300,
+}
+
+LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """Parse `-X importtime` stderr into entries with times in microseconds."""
+    entries = []
+    for line in output.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            entries.append({
+                'name': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                # Nesting is shown by two spaces per level after the first
+                'depth': max(0, (len(match.group(3)) - 1) // 2),
+            })
+    return entries
+
+
+def direct_imports(entries: List[Dict], module: str) -> List[Dict]:
+    """Entries imported directly by a top-level module import."""
+    children = []
+    for index in range(len(entries) - 1, -1, -1):
+        if entries[index]['name'] == module and entries[index]['depth'] == 0:
+            for entry in reversed(entries[:index]):
+                if entry['depth'] == 0:
+                    break
+                if entry['depth'] == 1:
+                    children.append(entry)
+            break
+    return children
+
+
+def profile_import(module: str, python: str = sys.executable, runs: int = 1) -> Dict:
+    """
+    Import a module in fresh interpreters and return the fastest run's profile.
+
+    The total is the module's cumulative import time, i.e. everything its
+    import pulls in beyond what the interpreter loads at startup.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+        entries = parse_importtime(result.stderr)
+        total = next((entry['cumulative_us'] for entry in reversed(entries)
+                      if entry['name'] == module and entry['depth'] == 0), 0)
+        if best is None or total < best['total_us']:
+            best = {'module': module, 'total_us': total, 'imports': entries}
+    return best
+
+
+def budget_ms(module: str) -> Optional[float]:
+    """Budget for a module, scaled by IMPORT_BUDGET_SCALE, or None if untracked."""
+    if module not in IMPORT_BUDGETS_MS:
+        return None
+    return IMPORT_BUDGETS_MS[module] * float(os.environ.get('IMPORT_BUDGET_SCALE', '1'))
+
+
+def format_report(profile: Dict, top: int = 15) -> str:
+    """Format a profile as the slowest imports by self and cumulative time."""
+    lines = [f"{profile['module']}: {profile['total_us'] / 1000:.1f} ms cold-start import"]
+    budget = budget_ms(profile['module'])
+    if budget is not None:
+        lines[0] += f" (budget {budget:.0f} ms)"
+
+    lines.append(f"\n  {'self ms':>9} {'cumul ms':>9}  direct imports")
+    children = direct_imports(profile['imports'], profile['module'])
+    for entry in sorted(children, key=lambda e: -e['cumulative_us'])[:top]:
+        lines.append(f"  {entry['self_us'] / 1000:>9.1f} {entry['cumulative_us'] / 1000:>9.1f}  {entry['name']}")
+
+    lines.append(f"\n  {'self ms':>9} {'cumul ms':>9}  slowest modules (self time)")
+    for entry in sorted(profile['imports'], key=lambda e: -e['self_us'])[:top]:
+        lines.append(f"  {entry['self_us'] / 1000:>9.1f} {entry['cumulative_us'] / 1000:>9.1f}  {entry['name']}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile cold-start import time')
+    parser.add_argument('modules', nargs='*', default=list(IMPORT_BUDGETS_MS),
+                        help='Modules to profile (default: all budgeted modules)')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters per module (fastest is kept)')
+    parser.add_argument('--top', type=int, default=15, help='Imports to list per section')
+    parser.add_argument('--check', action='store_true', help='Fail if a module exceeds its budget')
+    parser.add_argument('--json', action='store_true', help='Print profiles as JSON')
+
+    args = parser.parse_args()
+
+    profiles = [profile_import(module, runs=args.runs) for module in args.modules]
+
+    if args.json:
+        print(json.dumps(profiles, indent=2))
+    else:
+        print('\n\n'.join(format_report(profile, args.top) for profile in profiles))
+
+    if args.check:
+        over = [profile for profile in profiles
+                if budget_ms(profile['module']) is not None
+                and profile['total_us'] / 1000 > budget_ms(profile['module'])]
+        for profile in over:
+            print(f"\n{profile['module']} exceeds its import budget: "
+                  f"{profile['total_us'] / 1000:.1f} ms > {budget_ms(profile['module']):.0f} ms")
+        if over:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
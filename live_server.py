@@ -0,0 +1,98 @@
+"""
+Live Server Helpers
+Runs a WSGI app on a threaded server with an ephemeral port, waits for it to
+become ready and provides pooled keep-alive HTTP sessions for talking to it.
+"""
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Request handler that does not log every request."""
+
+    def log_request(self, *args, **kwargs):
+        """Skip per-request access logging."""
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session with a connection pool of the given size."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def wait_until_ready(base_url: str, timeout: float = 10.0, path: str = '/health') -> None:
+    """Poll the health endpoint until it answers 200 or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        try:
+            if requests.get(base_url + path, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+class LiveServer:
+    """
+    A WSGI app served from a background thread of the current process.
+
+    Binds to port 0 so the OS picks a free port, which keeps concurrent test
+    runs from colliding. Use as a context manager or call start()/stop().
+    """
+
+    def __init__(self, app, host: str = '127.0.0.1', port: int = 0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> 'LiveServer':
+        """Start serving and return once the health check passes."""
+        self._server = make_server(self.host, self.port, self.app, threaded=True,
+                                   request_handler=QuietRequestHandler)
+        self.port = self._server.server_port
+        # A short poll interval keeps stop() from waiting on the default 0.5s
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        name='live-server', daemon=True)
+        self._thread.start()
+        try:
+            wait_until_ready(self.url, timeout)
+        except RuntimeError:
+            self.stop()
+            raise
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and wait for its thread to finish."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> 'LiveServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Load generation and latency benchmark for the API simulator.
+Starts api_simulator on an ephemeral port (or targets --url) and drives it
+from several processes using pooled keep-alive sessions.
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from live_server import QuietRequestHandler, make_session, wait_until_ready
+
+
+# Operation name -> (HTTP method, path, payload factory)
+OPERATIONS = {
+    'add': ('POST', '/api/calculate/add', lambda rng: {'a': rng.uniform(-100, 100), 'b': rng.uniform(-100, 100)}),
+    'subtract': ('POST', '/api/calculate/subtract', lambda rng: {'a': rng.uniform(-100, 100), 'b': rng.uniform(-100, 100)}),
+    'multiply': ('POST', '/api/calculate/multiply', lambda rng: {'a': rng.uniform(-100, 100), 'b': rng.uniform(-100, 100)}),
+    'divide': ('POST', '/api/calculate/divide', lambda rng: {'a': rng.uniform(-100, 100), 'b': rng.uniform(1, 100)}),
+    'power': ('POST', '/api/calculate/power', lambda rng: {'base': rng.uniform(0, 10), 'exponent': rng.randint(0, 5)}),
+    'sqrt': ('POST', '/api/calculate/sqrt', lambda rng: {'number': rng.uniform(0, 1000)}),
+    'factorial': ('POST', '/api/calculate/factorial', lambda rng: {'number': rng.randint(0, 50)}),
+    'average': ('POST', '/api/calculate/average', lambda rng: {'numbers': [rng.random() for _ in range(100)]}),
+    'health': ('GET', '/health', None),
+}
+
+DEFAULT_MIX = 'add=4,multiply=2,divide=1,sqrt=1,average=1,health=1'
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse an operation mix such as "add=4,divide=1" into weights."""
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for operation: {name}")
+    if not any(mix.values()):
+        raise ValueError("Operation mix must have a positive total weight")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Summarize latencies (seconds) in milliseconds."""
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'mean_ms': 1000 * sum(values) / len(values) if values else 0.0,
+        'p50_ms': 1000 * percentile(values, 50),
+        'p95_ms': 1000 * percentile(values, 95),
+        'p99_ms': 1000 * percentile(values, 99),
+        'max_ms': 1000 * values[-1] if values else 0.0,
+    }
+
+
+def _serve(port_queue):
+    """Run the API on an ephemeral port in a child process."""
+    from werkzeug.serving import make_server
+    from api_simulator import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def start_server(timeout: float = 10.0):
+    """Start api_simulator in a child process; return (process, base_url) once it is ready."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+    process.start()
+    port = port_queue.get(timeout=timeout)
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        wait_until_ready(base_url, timeout)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process, base_url
+
+
+def _client_loop(session, base_url, mix, rng, start_at, stop_at, max_requests, results):
+    """Issue requests from start_at until stop_at (wall-clock) or the request budget."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    time.sleep(max(0.0, start_at - time.time()))
+    sent = 0
+    while time.time() < stop_at and (max_requests is None or sent < max_requests):
+        name = rng.choices(names, weights)[0]
+        method, path, payload = OPERATIONS[name]
+        body = payload(rng) if payload else None
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=30)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        results.append((name, time.perf_counter() - start, ok, time.time()))
+        sent += 1
+
+
+def _worker(args):
+    """Run `threads` concurrent clients in one process and return their samples."""
+    base_url, mix, threads, start_at, stop_at, max_requests, seed = args
+    session = make_session(threads)
+    # Open the pooled connections before the timed window
+    for _ in range(threads):
+        session.get(base_url + '/health', timeout=10)
+
+    per_thread = None if max_requests is None else max(1, max_requests // threads)
+    results = []
+    clients = [
+        threading.Thread(target=_client_loop, args=(
+            session, base_url, mix, random.Random(seed * 1000 + i), start_at, stop_at, per_thread, results))
+        for i in range(threads)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    session.close()
+    return results
+
+
+def run_load_test(base_url: str, mix: Dict[str, float], processes: int = 2, threads: int = 4,
+                  duration: float = 5.0, max_requests: Optional[int] = None, seed: int = 0,
+                  start_delay: float = 1.0) -> Dict:
+    """
+    Drive the API and return a JSON-serializable report.
+
+    All clients start together start_delay seconds from now, after the
+    worker processes have started and warmed up their connections.
+    """
+    start_at = time.time() + start_delay
+    stop_at = start_at + duration
+    per_process = None if max_requests is None else max(1, max_requests // processes)
+    jobs = [(base_url, mix, threads, start_at, stop_at, per_process, seed + i)
+            for i in range(processes)]
+
+    with multiprocessing.Pool(processes) as pool:
+        samples = [sample for result in pool.map(_worker, jobs) for sample in result]
+
+    elapsed = max((finished for _, _, _, finished in samples), default=start_at) - start_at
+    latencies = [latency for _, latency, _, _ in samples]
+    per_operation = {}
+    for name in mix:
+        op_latencies = [latency for op, latency, _, _ in samples if op == name]
+        if op_latencies:
+            per_operation[name] = latency_summary(op_latencies)
+
+    return {
+        'config': {
+            'processes': processes,
+            'threads_per_process': threads,
+            'duration_s': duration,
+            'max_requests': max_requests,
+            'mix': mix,
+        },
+        'requests': len(samples),
+        'errors': sum(1 for _, _, ok, _ in samples if not ok),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+        'latency': latency_summary(latencies),
+        'operations': per_operation,
+    }
+
+
+def compare_reports(baseline: Dict, current: Dict) -> Dict[str, Dict[str, float]]:
+    """Return baseline/current/change-percent for throughput and latency metrics."""
+    metrics = {'throughput_rps': (baseline['throughput_rps'], current['throughput_rps'])}
+    for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms'):
+        metrics[key] = (baseline['latency'][key], current['latency'][key])
+    return {
+        key: {
+            'baseline': old,
+            'current': new,
+            'change_pct': 100.0 * (new - old) / old if old else 0.0,
+        }
+        for key, (old, new) in metrics.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the API simulator')
+    parser.add_argument('--url', help='Target an already running server instead of starting one')
+    parser.add_argument('--processes', type=int, default=2, help='Number of client processes')
+    parser.add_argument('--threads', type=int, default=4, help='Concurrent clients per process')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run')
+    parser.add_argument('--requests', type=int, help='Stop after this many requests in total')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Operation weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the operation mix')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--compare', help='Compare against a previous JSON report')
+
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_server()
+    try:
+        report = run_load_test(base_url, mix, args.processes, args.threads,
+                               args.duration, args.requests, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = compare_reports(json.load(f), report)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
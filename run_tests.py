@@ -7,6 +7,14 @@ import subprocess
 import sys
 import os
 import argparse
+import glob
+import time
+
+import env_cache
+import sharding
+
+VENV_PYTHON = os.path.join('venv', 'bin', 'python')
+COVERAGE_ARGS = ['--cov=calculator', '--cov=api_simulator', '--cov-report=']
 
 
 def run_command(command, description):
@@ -32,6 +40,64 @@ def run_command(command, description):
         return False
 
 
+def run_parallel(workers, pytest_args=('-m', 'not integration'), python=VENV_PYTHON):
+    """
+    Run the test suite once, split across worker processes.
+
+    Tests are balanced across workers using recorded durations. Each worker
+    writes its own JUnit XML and coverage data, which are merged afterwards
+    into test-results/junit.xml, .coverage, coverage.xml and htmlcov/.
+    """
+    print(f"\n{'='*50}")
+    print(f"Running: Parallel tests ({workers} workers)")
+    print('='*50)
+
+    node_ids = sharding.collect_tests(pytest_args, python=python)
+    if not node_ids:
+        print("No tests collected")
+        return False
+    durations = sharding.load_durations()
+    shards = [shard for shard in sharding.partition(node_ids, workers, durations) if shard]
+
+    os.makedirs('test-results', exist_ok=True)
+    for stale in glob.glob('test-results/worker-*.xml') + glob.glob('.coverage.worker-*'):
+        os.remove(stale)
+
+    started = time.perf_counter()
+    processes = []
+    for index, shard in enumerate(shards):
+        env = dict(os.environ, COVERAGE_FILE=f'.coverage.worker-{index}')
+        command = [python, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+                   f'--junitxml=test-results/worker-{index}.xml', *COVERAGE_ARGS, *shard]
+        processes.append(subprocess.Popen(command, env=env, stdout=subprocess.PIPE,
+                                          stderr=subprocess.STDOUT, text=True))
+
+    success = True
+    for index, process in enumerate(processes):
+        output, _ = process.communicate()
+        if process.returncode != 0:
+            success = False
+            print(f"Worker {index} FAILED:")
+            print(output)
+    elapsed = time.perf_counter() - started
+
+    reports = sorted(glob.glob('test-results/worker-*.xml'))
+    totals = sharding.merge_junit_xml(reports, 'test-results/junit.xml')
+    durations.update(sharding.durations_from_junit(reports))
+    sharding.save_durations(durations)
+    for report in reports:
+        os.remove(report)
+
+    print(f"{totals['tests']} tests, {totals['failures']} failures, {totals['errors']} errors, "
+          f"{totals['skipped']} skipped in {elapsed:.2f}s across {len(shards)} workers")
+
+    coverage_files = sorted(glob.glob('.coverage.worker-*'))
+    if not sharding.combine_coverage(coverage_files, python=python):
+        print("Coverage merge failed!")
+        success = False
+    return success
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run tests for the calculator project')
     parser.add_argument('--unit', action='store_true', help='Run unit tests only')
@@ -40,17 +106,34 @@ def main():
     parser.add_argument('--coverage', action='store_true', help='Generate coverage report')
     parser.add_argument('--all', action='store_true', help='Run all tests with coverage')
     parser.add_argument('--server', action='store_true', help='Start the API server')
+    parser.add_argument('--watch', action='store_true',
+                        help='Rerun affected tests whenever files change, using a warm worker')
+    parser.add_argument('--rebuild-env', action='store_true',
+                        help='Recreate the cached virtual environment (reuses cached wheels)')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='Run all tests with coverage in one pass across N worker processes')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='Run shard I of N (1-based), e.g. one per build agent, with coverage')
+    parser.add_argument('--merge-shards', action='store_true',
+                        help='Merge the JUnit XML, coverage and timings of all shards into single reports')
+    parser.add_argument('--record-impact', action='store_true',
+                        help='Run all tests recording which tests cover each line (impact index)')
+    parser.add_argument('--affected', action='store_true',
+                        help='Run only tests affected by changes since the impact index was recorded')
+    parser.add_argument('--bench', action='store_true',
+                        help='Run microbenchmarks and fail on regressions against the stored baseline')
+    parser.add_argument('--bench-save', action='store_true',
+                        help='Run microbenchmarks and save them as this machine\'s baseline')
+    parser.add_argument('--bench-tolerance', type=float, default=0.25,
+                        help='Allowed slowdown for --bench as a fraction (default: 0.25)')
     
     args = parser.parse_args()
     
-    # Check if virtual environment exists
-    if not os.path.exists('venv'):
-        print("Creating virtual environment...")
-        if not run_command('python3 -m venv venv', 'Creating virtual environment'):
-            sys.exit(1)
-    
-    # Install dependencies
-    if not run_command('source venv/bin/activate && pip install -r requirements.txt', 'Installing dependencies'):
+    # Reuse the cached environment for this requirements.txt and interpreter
+    try:
+        env_cache.ensure_environment('requirements.txt', link='venv', rebuild=args.rebuild_env)
+    except RuntimeError as e:
+        print(f"Environment setup failed: {e}")
         sys.exit(1)
     
     if args.server:
@@ -63,6 +146,61 @@ def main():
             print("\nServer stopped.")
         return
     
+    if args.workers:
+        if not run_parallel(args.workers):
+            print("Tests failed!")
+            sys.exit(1)
+        print("\n🎉 All tests passed! Reports in test-results/junit.xml, coverage.xml and htmlcov/")
+        return
+    
+    if args.shard:
+        try:
+            index, count = sharding.parse_shard(args.shard)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        code = sharding.run_shard(index, count, python=VENV_PYTHON, coverage_args=COVERAGE_ARGS)
+        print(f"Shard results in {sharding.SHARD_DIR}/; merge them with --merge-shards")
+        sys.exit(code)
+    
+    if args.merge_shards:
+        try:
+            totals = sharding.merge_shards(python=VENV_PYTHON)
+        except (ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        print(f"{totals['tests']} tests, {totals['failures']} failures, {totals['errors']} errors, "
+              f"{totals['skipped']} skipped across shards")
+        if totals['failures'] or totals['errors']:
+            sys.exit(1)
+        print("\n🎉 All shards passed! Reports in test-results/junit.xml, coverage.xml and htmlcov/")
+        return
+    
+    if args.record_impact:
+        if not run_command('source venv/bin/activate && python impact.py record', 'Recording Impact Index'):
+            sys.exit(1)
+        return
+    
+    if args.affected:
+        if not run_command('source venv/bin/activate && python impact.py run -v', 'Affected Tests'):
+            print("Tests failed!")
+            sys.exit(1)
+        return
+    
+    if args.bench or args.bench_save:
+        mode = '--save' if args.bench_save else f'--check --tolerance {args.bench_tolerance}'
+        if not run_command(f'source venv/bin/activate && python benchmark.py {mode}', 'Microbenchmarks'):
+            print("Benchmark check failed!")
+            sys.exit(1)
+        return
+    
+    if args.watch:
+        try:
+            subprocess.run('source venv/bin/activate && python watch.py', shell=True)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        return
+    
     if args.unit:
         run_command('source venv/bin/activate && python -m pytest test_calculator.py -v', 'Unit Tests')
     
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Test Sharding Module
+Splits collected pytest items into duration-balanced shards and merges the
+JUnit XML, coverage and timing data produced by each shard, whether the
+shards run as local worker processes or on separate build agents.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DURATIONS_FILE = '.test_durations.json'
+
+# Where `run` writes each shard's JUnit XML, coverage data and manifest
+SHARD_DIR = os.path.join('test-results', 'shards')
+
+# Assumed duration of a test with no recorded timing
+DEFAULT_DURATION = 0.1
+
+
+def collect_tests(pytest_args: Sequence[str] = (), python: str = 'python') -> List[str]:
+    """Return the node ids pytest would run for the given arguments."""
+    result = subprocess.run(
+        [python, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider', *pytest_args],
+        capture_output=True, text=True,
+    )
+    # Exit code 5 means no tests were collected
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f"Test collection failed:\n{result.stdout}{result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines() if '::' in line]
+
+
+def junit_key(node_id: str) -> str:
+    """
+    Convert a pytest node id into the key used for recorded durations.
+
+    The key matches JUnit XML's classname/name pair, so durations can be read
+    back from reports: "test_api.py::TestAPIHealth::test_health_check"
+    becomes "test_api.TestAPIHealth::test_health_check".
+    """
+    path, *parts = node_id.split('::')
+    module = path[:-3] if path.endswith('.py') else path
+    classname = '.'.join([module.replace('/', '.')] + parts[:-1])
+    return f"{classname}::{parts[-1]}" if parts else classname
+
+
+def load_durations(path: str = DURATIONS_FILE) -> Dict[str, float]:
+    """Load recorded per-test durations, or an empty mapping."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_durations(durations: Dict[str, float], path: str = DURATIONS_FILE) -> None:
+    """Write per-test durations, keeping the file stable for diffs."""
+    with open(path, 'w') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def durations_from_junit(paths: Sequence[str]) -> Dict[str, float]:
+    """Read per-test durations from JUnit XML reports."""
+    durations = {}
+    for path in paths:
+        for case in ET.parse(path).getroot().iter('testcase'):
+            key = f"{case.get('classname')}::{case.get('name')}"
+            durations[key] = float(case.get('time', 0))
+    return durations
+
+
+def partition(node_ids: Sequence[str], shards: int,
+              durations: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """
+    Split tests into `shards` groups with roughly equal total duration.
+
+    Uses longest-processing-time-first greedy assignment, which is
+    deterministic for the same inputs. Tests without a recorded duration
+    are assumed to take the average of the recorded ones. Each shard keeps
+    the original collection order so module and class fixtures are reused.
+    """
+    if shards < 1:
+        raise ValueError("Number of shards must be at least 1")
+    durations = durations or {}
+    known = [durations[junit_key(node_id)] for node_id in node_ids if junit_key(node_id) in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+
+    order = {node_id: index for index, node_id in enumerate(node_ids)}
+    weighted = sorted(node_ids, key=lambda node_id: (-durations.get(junit_key(node_id), default),
+                                                     order[node_id]))
+    totals = [0.0] * shards
+    groups = [[] for _ in range(shards)]
+    for node_id in weighted:
+        lightest = min(range(shards), key=lambda i: (totals[i], i))
+        groups[lightest].append(node_id)
+        totals[lightest] += durations.get(junit_key(node_id), default)
+    return [sorted(group, key=order.__getitem__) for group in groups]
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a 1-based shard spec such as "2/4" into (index, count)."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}, expected i/N such as 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {spec!r}, index must be between 1 and N")
+    return index, count
+
+
+def plan_id(shards: Sequence[Sequence[str]]) -> str:
+    """
+    Fingerprint of a complete partition.
+
+    Every shard of one run records it, so merging can detect agents that
+    collected different tests or used different duration data.
+    """
+    return hashlib.sha256(json.dumps(shards).encode()).hexdigest()[:16]
+
+
+def shard_paths(index: int, count: int, directory: str = SHARD_DIR) -> Dict[str, str]:
+    """File names of one shard's JUnit XML, coverage data and manifest."""
+    base = os.path.join(directory, f"shard-{index}-of-{count}")
+    return {'junit': f"{base}.xml", 'coverage': f"{base}.coverage", 'manifest': f"{base}.json"}
+
+
+def run_shard(index: int, count: int, pytest_args: Sequence[str] = ('-m', 'not integration'),
+              python: str = sys.executable, coverage_args: Sequence[str] = (),
+              directory: str = SHARD_DIR, durations_file: str = DURATIONS_FILE) -> int:
+    """
+    Run one shard of the suite and return pytest's exit code.
+
+    The partition only depends on the collected tests and the durations
+    file, so every agent computes the same shards from the same checkout.
+    Writes the shard's JUnit XML, coverage data and a manifest naming its
+    tests into `directory` for merge_shards().
+    """
+    node_ids = collect_tests(pytest_args, python=python)
+    shards = partition(node_ids, count, load_durations(durations_file))
+    tests = shards[index - 1]
+    paths = shard_paths(index, count, directory)
+    os.makedirs(directory, exist_ok=True)
+    for path in paths.values():
+        if os.path.exists(path):
+            os.remove(path)
+
+    with open(paths['manifest'], 'w') as f:
+        json.dump({'index': index, 'count': count, 'plan': plan_id(shards), 'tests': tests}, f, indent=2)
+    print(f"Shard {index}/{count}: {len(tests)} of {len(node_ids)} tests")
+    if not tests:
+        return 0
+
+    env = dict(os.environ, COVERAGE_FILE=paths['coverage'])
+    command = [python, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+               f"--junitxml={paths['junit']}", *coverage_args, *tests]
+    return subprocess.run(command, env=env).returncode
+
+
+def merge_shards(directory: str = SHARD_DIR, junit_output: str = os.path.join('test-results', 'junit.xml'),
+                 durations_file: str = DURATIONS_FILE, python: str = sys.executable,
+                 coverage: bool = True) -> Dict[str, float]:
+    """
+    Merge the reports of every shard in `directory`.
+
+    Checks that all shards of one plan are present, then writes a single
+    JUnit XML report, updates the durations file with the new timings and
+    combines coverage into .coverage, coverage.xml and htmlcov/. Returns
+    the merged JUnit totals; raises ValueError for a missing or
+    inconsistent set of shards.
+    """
+    manifests = []
+    for path in sorted(glob.glob(os.path.join(directory, 'shard-*.json'))):
+        with open(path) as f:
+            manifests.append(json.load(f))
+    if not manifests:
+        raise ValueError(f"No shard manifests found in {directory}")
+
+    count = manifests[0]['count']
+    plans = {manifest['plan'] for manifest in manifests}
+    if len(plans) > 1 or any(manifest['count'] != count for manifest in manifests):
+        raise ValueError("Shards were partitioned differently; make sure every agent used the same "
+                         "checkout and durations file")
+    missing = sorted(set(range(1, count + 1)) - {manifest['index'] for manifest in manifests})
+    if missing:
+        raise ValueError(f"Missing results for shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
+
+    manifests.sort(key=lambda manifest: manifest['index'])
+    reports = [shard_paths(m['index'], count, directory)['junit'] for m in manifests if m['tests']]
+    absent = [report for report in reports if not os.path.exists(report)]
+    if absent:
+        raise ValueError(f"Missing JUnit report(s): {', '.join(absent)}")
+
+    totals = merge_junit_xml(reports, junit_output)
+    durations = load_durations(durations_file)
+    durations.update(durations_from_junit(reports))
+    save_durations(durations, durations_file)
+
+    data_files = [path for path in (shard_paths(m['index'], count, directory)['coverage'] for m in manifests)
+                  if os.path.exists(path)]
+    if coverage and data_files and not combine_coverage(data_files, python=python):
+        raise RuntimeError("Coverage merge failed")
+    return totals
+
+
+def merge_junit_xml(paths: Sequence[str], output: str, name: str = 'pytest') -> Dict[str, float]:
+    """
+    Merge several JUnit XML reports into a single test suite.
+
+    Returns the merged totals (tests, failures, errors, skipped, time).
+    """
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0, 'time': 0.0}
+    merged = ET.Element('testsuite', name=name)
+    for path in paths:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == 'testsuite' else root.findall('testsuite')
+        for suite in suites:
+            for key in ('tests', 'failures', 'errors', 'skipped'):
+                totals[key] += int(suite.get(key, 0))
+            totals['time'] += float(suite.get('time', 0))
+            merged.extend(suite.findall('testcase'))
+
+    for key, value in totals.items():
+        merged.set(key, f"{value:.3f}" if key == 'time' else str(value))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    root = ET.Element('testsuites')
+    root.append(merged)
+    ET.ElementTree(root).write(output, encoding='utf-8', xml_declaration=True)
+    return totals
+
+
+def combine_coverage(data_files: Sequence[str], python: str = 'python',
+                     xml_report: Optional[str] = 'coverage.xml',
+                     html_report: Optional[str] = 'htmlcov') -> bool:
+    """Combine coverage data files into .coverage and write the reports."""
+    commands = [[python, '-m', 'coverage', 'combine', *data_files]]
+    if xml_report:
+        commands.append([python, '-m', 'coverage', 'xml', '-o', xml_report])
+    if html_report:
+        commands.append([python, '-m', 'coverage', 'html', '-d', html_report])
+    commands.append([python, '-m', 'coverage', 'report', '-m'])
+    for command in commands:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.stdout:
+            print(result.stdout)
+        if result.returncode != 0:
+            print(result.stderr)
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one test shard or merge the results of all shards')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='Run shard i of N, e.g. "run 2/4"')
+    run_parser.add_argument('shard', help='Shard to run as i/N (1-based)')
+    run_parser.add_argument('--dir', default=SHARD_DIR, help='Directory for shard results')
+    run_parser.add_argument('--cov', action='append', default=[], metavar='MODULE',
+                            help='Measure coverage of a module (repeatable)')
+    merge_parser = subparsers.add_parser('merge', help='Merge the results of all shards')
+    merge_parser.add_argument('--dir', default=SHARD_DIR, help='Directory holding shard results')
+    merge_parser.add_argument('--junit', default=os.path.join('test-results', 'junit.xml'),
+                              help='Merged JUnit XML report')
+
+    args, pytest_args = parser.parse_known_args()
+
+    try:
+        if args.command == 'run':
+            index, count = parse_shard(args.shard)
+            coverage_args = [f'--cov={module}' for module in args.cov]
+            if coverage_args:
+                coverage_args.append('--cov-report=')
+            sys.exit(run_shard(index, count, pytest_args or ('-m', 'not integration'),
+                               coverage_args=coverage_args, directory=args.dir))
+
+        totals = merge_shards(args.dir, args.junit)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+    print(f"{totals['tests']} tests, {totals['failures']} failures, {totals['errors']} errors, "
+          f"{totals['skipped']} skipped across shards; merged report in {args.junit}")
+    sys.exit(1 if totals['failures'] or totals['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
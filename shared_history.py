@@ -0,0 +1,254 @@
+"""
+Shared History Module
+A calculation history kept in a named shared-memory ring buffer, so every
+worker process of a pre-fork server appends to and reads one history.
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+DEFAULT_NAME = 'calculator-history'
+DEFAULT_CAPACITY = 1024
+# Bytes of UTF-8 text per entry; longer entries are truncated
+DEFAULT_RECORD_SIZE = 256
+
+MAGIC = b'CHST'
+VERSION = 1
+
+# magic, version, capacity, record size, head (next sequence), start (first visible sequence)
+HEADER = struct.Struct('<4sIIIQQ')
+HEAD_OFFSET = 16
+START_OFFSET = 24
+SEQUENCE = struct.Struct('<Q')
+
+# Per slot: committed sequence + 1 (0 while empty or being written), timestamp, text length
+SLOT_HEADER = struct.Struct('<QdI')
+
+ELLIPSIS = '…'.encode('utf-8')
+
+# Open histories, so forked children can take their own writer locks
+_instances = weakref.WeakSet()
+
+
+def _reopen_locks_after_fork() -> None:
+    """Give every history inherited by a forked child its own lock."""
+    for history in list(_instances):
+        history._open_lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reopen_locks_after_fork)
+
+
+def lock_path(name: str) -> str:
+    """Path of the lock file serialising writers to a history."""
+    return os.path.join(tempfile.gettempdir(), f"{name}.lock")
+
+
+def unlink(name: str) -> None:
+    """Remove a history's segment and lock file without attaching to it."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        pass
+    else:
+        segment.close()
+        segment.unlink()
+    try:
+        os.remove(lock_path(name))
+    except FileNotFoundError:
+        pass
+
+
+def _open_segment(name: str, create: bool, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Open a segment without tying its lifetime to this process.
+
+    By default the resource tracker unlinks segments when the process that
+    opened them exits, which would delete the history under the other
+    workers; the segment is only removed by SharedHistory.unlink().
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+def truncate(text: str, size: int) -> bytes:
+    """Encode text as UTF-8 in at most size bytes, marking cut entries with an ellipsis."""
+    data = text.encode('utf-8')
+    if len(data) <= size:
+        return data
+    cut = data[:size - len(ELLIPSIS)]
+    # Drop a partially cut multi-byte character
+    return cut.decode('utf-8', 'ignore').encode('utf-8') + ELLIPSIS
+
+
+class SharedHistory:
+    """
+    Fixed-record ring buffer of history entries in shared memory.
+
+    Writers reserve a sequence number from the head counter under a
+    cross-process file lock and publish the slot by storing its sequence
+    last. Readers take no lock: they copy a slot and keep it only if its
+    sequence is unchanged afterwards, so entries overwritten mid-read are
+    skipped instead of returned torn. Once full, the oldest entries are
+    overwritten.
+
+    Supports the list operations Calculator uses (append, clear, copy, len,
+    iteration), so it can be passed as a calculator's history.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = DEFAULT_CAPACITY,
+                 record_size: int = DEFAULT_RECORD_SIZE):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        if record_size < len(ELLIPSIS):
+            raise ValueError(f"Record size must be at least {len(ELLIPSIS)} bytes")
+        self.name = name
+        self._segment = None
+        self._lock_file = None
+        self._open_lock()
+        slot_size = SLOT_HEADER.size + record_size
+        # Keep slots 8-byte aligned so sequence stores are single aligned writes
+        self._slot_size = (slot_size + 7) // 8 * 8
+        try:
+            with self._locked():
+                try:
+                    self._segment = _open_segment(name, create=False)
+                    self._attach(capacity, record_size)
+                except FileNotFoundError:
+                    self._segment = _open_segment(name, create=True,
+                                                  size=HEADER.size + capacity * self._slot_size)
+                    HEADER.pack_into(self._segment.buf, 0, MAGIC, VERSION, capacity, record_size, 0, 0)
+        except ValueError:
+            self._lock_file.close()
+            raise
+        self.capacity = capacity
+        self.record_size = record_size
+        _instances.add(self)
+
+    def _open_lock(self) -> None:
+        """
+        Open this process's handle on the lock file.
+
+        flock() locks belong to the open file description, which a forked
+        child shares with its parent, so each process needs its own handle
+        for the lock to keep processes apart.
+        """
+        if self._lock_file is not None:
+            self._lock_file.close()
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(lock_path(self.name), 'a+b')
+
+    def _attach(self, capacity: int, record_size: int) -> None:
+        """Check an existing segment was created with the same layout."""
+        magic, version, existing_capacity, existing_size, _, _ = HEADER.unpack_from(self._segment.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._segment.close()
+            raise ValueError(f"Shared memory segment {self.name!r} is not a version {VERSION} history")
+        if (existing_capacity, existing_size) != (capacity, record_size):
+            self._segment.close()
+            raise ValueError(f"Shared history {self.name!r} exists with capacity {existing_capacity} "
+                             f"and record size {existing_size}")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the writer lock across threads and processes."""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _counter(self, offset: int) -> int:
+        return SEQUENCE.unpack_from(self._segment.buf, offset)[0]
+
+    def _slot(self, sequence: int) -> int:
+        return HEADER.size + (sequence % self.capacity) * self._slot_size
+
+    def append(self, entry: str) -> None:
+        """Append an entry, overwriting the oldest one when the buffer is full."""
+        data = truncate(entry, self.record_size)
+        buf = self._segment.buf
+        with self._locked():
+            sequence = self._counter(HEAD_OFFSET)
+            offset = self._slot(sequence)
+            SEQUENCE.pack_into(buf, offset, 0)
+            SLOT_HEADER.pack_into(buf, offset, 0, time.time(), len(data))
+            start = offset + SLOT_HEADER.size
+            buf[start:start + len(data)] = data
+            SEQUENCE.pack_into(buf, offset, sequence + 1)
+            SEQUENCE.pack_into(buf, HEAD_OFFSET, sequence + 1)
+
+    def _read(self, sequence: int) -> Optional[str]:
+        """Read one entry, or None if it was overwritten while reading."""
+        buf = self._segment.buf
+        offset = self._slot(sequence)
+        committed, _, length = SLOT_HEADER.unpack_from(buf, offset)
+        if committed != sequence + 1 or length > self.record_size:
+            return None
+        start = offset + SLOT_HEADER.size
+        data = bytes(buf[start:start + length])
+        if self._counter(offset) != committed:
+            return None
+        return data.decode('utf-8', 'replace')
+
+    def entries(self) -> List[str]:
+        """Visible entries, oldest first."""
+        head = self._counter(HEAD_OFFSET)
+        first = max(self._counter(START_OFFSET), head - self.capacity)
+        result = []
+        for sequence in range(first, head):
+            entry = self._read(sequence)
+            if entry is not None:
+                result.append(entry)
+        return result
+
+    def clear(self) -> None:
+        """Hide all current entries from every process."""
+        with self._locked():
+            SEQUENCE.pack_into(self._segment.buf, START_OFFSET, self._counter(HEAD_OFFSET))
+
+    def copy(self) -> List[str]:
+        """Snapshot of the entries as a list, like list.copy()."""
+        return self.entries()
+
+    def __len__(self) -> int:
+        head = self._counter(HEAD_OFFSET)
+        return head - max(self._counter(START_OFFSET), head - self.capacity)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries())
+
+    def close(self) -> None:
+        """Detach this process; the history stays available to others."""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+            self._lock_file.close()
+            _instances.discard(self)
+
+    def unlink(self) -> None:
+        """Remove the shared segment and its lock file for all processes."""
+        unlink(self.name)
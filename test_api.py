@@ -3,24 +3,16 @@ Test cases for the API simulator using pytest and requests.
 """
 
 import pytest
-import requests
+import gzip
 import json
+import threading
 import time
-from api_simulator import app
+import uuid
+import shared_history
+from api_simulator import create_app
+from vector_ops import decode_array, encode_array
 
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app."""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
-
-@pytest.fixture
-def api_url():
-    """Base URL for API testing."""
-    return "http://localhost:5000"
+# The client fixture (one app per session, state restored per test) is in conftest.py
 
 
 class TestAPIHealth:
@@ -192,6 +184,179 @@ class TestAPICalculator:
         assert 'error' in result
 
 
+class TestAPIAppFactory:
+    """Test the application factory."""
+    
+    def test_apps_have_independent_history(self):
+        """Test each created app gets its own calculator and history."""
+        first = create_app({'TESTING': True}).test_client()
+        second = create_app({'TESTING': True}).test_client()
+        first.post('/api/calculate/add', 
+                   data=json.dumps({'a': 1, 'b': 2}),
+                   content_type='application/json')
+        
+        assert len(json.loads(first.get('/api/history').data)['history']) == 1
+        assert json.loads(second.get('/api/history').data)['history'] == []
+    
+    def test_shared_history_backend(self):
+        """Test apps using the shared backend see one history."""
+        config = {'HISTORY_BACKEND': 'shared', 'HISTORY_NAME': f"test-api-{uuid.uuid4().hex[:12]}"}
+        apps = []
+        try:
+            first_app = create_app(config)
+            apps.append(first_app)
+            second_app = create_app(config)
+            apps.append(second_app)
+            first_app.test_client().post('/api/calculate/add', 
+                                         data=json.dumps({'a': 1, 'b': 2}),
+                                         content_type='application/json')
+            
+            response = second_app.test_client().get('/api/history')
+            assert json.loads(response.data)['history'] == ['1.0 + 2.0 = 3.0']
+            
+            second_app.test_client().delete('/api/history')
+            response = first_app.test_client().get('/api/history')
+            assert json.loads(response.data)['history'] == []
+            
+            # A per-process index would disagree with the shared history
+            for path in ('/api/history/query', '/api/history/aggregate'):
+                response = first_app.test_client().get(path)
+                assert response.status_code == 501
+                assert 'shared history backend' in json.loads(response.data)['error']
+        finally:
+            for created in apps:
+                created.extensions['calculator'].history.close()
+            shared_history.unlink(config['HISTORY_NAME'])
+    
+    def test_history_settings_from_environment(self, monkeypatch):
+        """Test history settings are read from the environment by the factory."""
+        monkeypatch.setenv('HISTORY_CAPACITY', '64')
+        assert create_app().config['HISTORY_CAPACITY'] == 64
+        
+        monkeypatch.setenv('HISTORY_CAPACITY', 'many')
+        with pytest.raises(ValueError, match="HISTORY_CAPACITY must be an integer"):
+            create_app()
+    
+    def test_batching_settings_from_environment(self, monkeypatch):
+        """Test batching flags and windows are parsed from the environment."""
+        monkeypatch.setenv('BATCHING', 'yes')
+        monkeypatch.setenv('BATCH_WINDOW_MS', '0.5')
+        app = create_app()
+        assert app.config['BATCHING'] is True
+        assert app.extensions['batcher'].window == 0.0005
+        
+        monkeypatch.setenv('BATCHING', 'sometimes')
+        with pytest.raises(ValueError, match="BATCHING must be true or false"):
+            create_app()
+    
+    def test_batching_concurrent_requests(self):
+        """Test batched requests return their own results and are all recorded."""
+        app = create_app({'TESTING': True, 'BATCHING': True, 'BATCH_WINDOW_MS': 50})
+        responses = [None] * 8
+        
+        def post(position):
+            responses[position] = app.test_client().post(
+                '/api/calculate/multiply',
+                data=json.dumps({'a': position, 'b': 10}),
+                content_type='application/json')
+        
+        threads = [threading.Thread(target=post, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        app.extensions['batcher'].close()
+        
+        assert [json.loads(r.data)['result'] for r in responses] == [10.0 * i for i in range(8)]
+        assert app.extensions['batcher'].stats()['batches'] < 8
+        assert len(json.loads(app.test_client().get('/api/history').data)['history']) == 8
+    
+    def test_unknown_history_backend(self):
+        """Test an unknown history backend is rejected."""
+        with pytest.raises(ValueError, match="Unknown history backend"):
+            create_app({'HISTORY_BACKEND': 'redis'})
+    
+    def test_factory_config_overrides_defaults(self):
+        """Test config passed to the factory wins over extension defaults."""
+        client = create_app({'COMPRESS_MIN_SIZE': 0}).test_client()
+        response = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+
+class TestAPIHistoryQuery:
+    """Test history query and aggregation endpoints."""
+    
+    @pytest.fixture
+    def fresh_client(self):
+        """Client of a new app with an empty history."""
+        client = create_app({'TESTING': True}).test_client()
+        for path, data in [('add', {'a': 1, 'b': 2}), ('add', {'a': 10, 'b': 20}),
+                           ('divide', {'a': 1, 'b': 0}), ('power', {'base': 2, 'exponent': 3})]:
+            client.post(f'/api/calculate/{path}', 
+                        data=json.dumps(data),
+                        content_type='application/json')
+        return client
+    
+    def test_query_by_operation(self, fresh_client):
+        """Test querying records of one operation."""
+        response = fresh_client.get('/api/history/query?op=add')
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['count'] == 2
+        assert [record['result'] for record in data['records']] == [3.0, 30.0]
+    
+    def test_query_filters(self, fresh_client):
+        """Test result range, status, time range and limit filters."""
+        data = json.loads(fresh_client.get('/api/history/query?min_result=5').data)
+        assert [record['op'] for record in data['records']] == ['add', 'power']
+        
+        data = json.loads(fresh_client.get('/api/history/query?status=error&last=300').data)
+        assert [record['error'] for record in data['records']] == ['Cannot divide by zero']
+        
+        data = json.loads(fresh_client.get(f'/api/history/query?start={time.time() + 60}').data)
+        assert data['records'] == []
+        
+        data = json.loads(fresh_client.get('/api/history/query?limit=1').data)
+        assert [record['op'] for record in data['records']] == ['power']
+    
+    def test_aggregate(self, fresh_client):
+        """Test aggregates answer counts and means without listing records."""
+        data = json.loads(fresh_client.get('/api/history/aggregate?op=divide&last=300').data)
+        assert (data['count'], data['errors']) == (0, 1)
+        
+        data = json.loads(fresh_client.get('/api/history/aggregate?op=add').data)
+        assert (data['count'], data['mean'], data['min'], data['max']) == (2, 16.5, 3.0, 30.0)
+    
+    def test_clear_history_clears_index(self, fresh_client):
+        """Test clearing history also empties the query results."""
+        fresh_client.delete('/api/history')
+        data = json.loads(fresh_client.get('/api/history/aggregate').data)
+        assert (data['count'], data['errors']) == (0, 0)
+    
+    def test_index_keeps_history_capacity(self):
+        """Test the index keeps only the last HISTORY_CAPACITY records."""
+        client = create_app({'TESTING': True, 'HISTORY_CAPACITY': 2}).test_client()
+        for a in (1, 2, 3):
+            client.post('/api/calculate/add', 
+                        data=json.dumps({'a': a, 'b': 0}),
+                        content_type='application/json')
+        
+        data = json.loads(client.get('/api/history/query').data)
+        assert [record['result'] for record in data['records']] == [2.0, 3.0]
+        assert json.loads(client.get('/api/history/aggregate').data)['count'] == 2
+    
+    def test_invalid_filters(self, fresh_client):
+        """Test invalid filter values return errors."""
+        response = fresh_client.get('/api/history/query?start=yesterday')
+        assert response.status_code == 400
+        assert 'Invalid value for start' in json.loads(response.data)['error']
+        
+        assert fresh_client.get('/api/history/query?limit=-1').status_code == 400
+        assert fresh_client.get('/api/history/query?status=maybe').status_code == 400
+        assert fresh_client.get('/api/history/aggregate?max_result=x').status_code == 400
+
+
 class TestAPIErrorHandling:
     """Test API error handling."""
     
@@ -230,6 +395,83 @@ class TestAPIErrorHandling:
         assert 'error' in result
 
 
+class TestAPIVector:
+    """Test vector and matrix API endpoints."""
+    
+    def test_vector_add_json(self, client):
+        """Test elementwise addition with JSON arrays."""
+        data = {'a': [1, 2, 3], 'b': [4, 5, 6]}
+        response = client.post('/api/vector/add', 
+                             data=json.dumps(data),
+                             content_type='application/json')
+        
+        assert response.status_code == 200
+        result = json.loads(response.data)
+        assert result['operation'] == 'add'
+        assert result['shape'] == [3]
+        assert result['result'] == [5.0, 7.0, 9.0]
+    
+    def test_vector_mean_json(self, client):
+        """Test vector reduction with a JSON array."""
+        response = client.post('/api/vector/mean', 
+                             data=json.dumps({'values': [1, 2, 3, 4]}),
+                             content_type='application/json')
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['result'] == 2.5
+    
+    def test_vector_dot_binary(self, client):
+        """Test dot product with a binary payload."""
+        response = client.post('/api/vector/dot', 
+                             data=encode_array([1.0, 2.0, 3.0]) + encode_array([4.0, 5.0, 6.0]),
+                             content_type='application/octet-stream',
+                             headers={'X-Shape-A': '3', 'X-Shape-B': '3'})
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['result'] == 32.0
+    
+    def test_matmul_binary_response(self, client):
+        """Test matrix multiplication returning a binary array."""
+        payload = encode_array([[1.0, 2.0], [3.0, 4.0]]) + encode_array([[1.0], [1.0]])
+        response = client.post('/api/vector/matmul', 
+                             data=payload,
+                             content_type='application/octet-stream',
+                             headers={'X-Shape-A': '2,2', 'X-Shape-B': '2,1',
+                                      'Accept': 'application/octet-stream'})
+        
+        assert response.status_code == 200
+        assert response.headers['X-Shape'] == '2,1'
+        result = decode_array(response.data, (2, 1))
+        assert [list(row) for row in result] == [[3.0], [7.0]]
+    
+    def test_vector_length_mismatch(self, client):
+        """Test vectors of different lengths via API."""
+        response = client.post('/api/vector/add', 
+                             data=json.dumps({'a': [1, 2], 'b': [1]}),
+                             content_type='application/json')
+        
+        assert response.status_code == 400
+        assert 'same length' in json.loads(response.data)['error']
+    
+    def test_binary_size_mismatch(self, client):
+        """Test a binary payload that does not match its shape headers."""
+        response = client.post('/api/vector/sum', 
+                             data=encode_array([1.0, 2.0]),
+                             content_type='application/octet-stream',
+                             headers={'X-Shape-VALUES': '3'})
+        
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+    
+    def test_unknown_vector_operation(self, client):
+        """Test an unsupported vector operation."""
+        response = client.post('/api/vector/cross', 
+                             data=json.dumps({'a': [1], 'b': [1]}),
+                             content_type='application/json')
+        
+        assert response.status_code == 404
+
+
 class TestAPIHistory:
     """Test API history functionality."""
     
@@ -249,7 +491,14 @@ class TestAPIHistory:
         assert response.status_code == 200
         result = json.loads(response.data)
         assert 'history' in result
-        assert len(result['history']) >= 2
+        assert result['history'] == ['5.0 + 3.0 = 8.0', '2.0 * 4.0 = 8.0']
+    
+    def test_history_does_not_leak_between_tests(self, client):
+        """Test each test starts from the app's initial, empty history."""
+        response = client.get('/api/history')
+        assert json.loads(response.data)['history'] == []
+        response = client.get('/api/history/aggregate')
+        assert json.loads(response.data)['count'] == 0
     
     def test_clear_history(self, client):
         """Test clearing calculation history."""
@@ -270,6 +519,39 @@ class TestAPIHistory:
         assert len(result['history']) == 0
 
 
+class TestAPICompression:
+    """Test API response and request compression."""
+    
+    def test_large_average_response_compressed(self, client):
+        """Test large average responses are gzip compressed."""
+        data = {'numbers': list(range(1000))}
+        response = client.post('/api/calculate/average', 
+                             data=json.dumps(data),
+                             content_type='application/json',
+                             headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        result = json.loads(gzip.decompress(response.data))
+        assert result['result'] == 499.5
+    
+    def test_small_response_not_compressed(self, client):
+        """Test small responses stay uncompressed."""
+        response = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert json.loads(response.data)['status'] == 'healthy'
+    
+    def test_gzip_request_body(self, client):
+        """Test a gzip compressed request body via API."""
+        response = client.post('/api/calculate/add', 
+                             data=gzip.compress(json.dumps({'a': 2, 'b': 3}).encode()),
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'gzip'})
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['result'] == 5
+
+
 class TestAPIIntegration:
     """Test API integration scenarios."""
     
@@ -323,34 +605,39 @@ class TestAPIIntegration:
         assert abs(sqrt_result - 3.6056) < 0.001
 
 
-# Integration tests that require a running server
+# Integration tests against a live server (see the live_server fixture in conftest.py)
 class TestAPIIntegrationWithServer:
-    """Integration tests that require a running API server."""
+    """Integration tests that run against a live API server."""
     
     @pytest.mark.integration
-    def test_api_server_health(self, api_url):
+    def test_api_server_health(self, api_url, api_session):
         """Test API server health endpoint."""
-        try:
-            response = requests.get(f"{api_url}/health", timeout=5)
-            assert response.status_code == 200
-            data = response.json()
-            assert data['status'] == 'healthy'
-        except requests.exceptions.RequestException:
-            pytest.skip("API server is not running")
+        response = api_session.get(f"{api_url}/health", timeout=5)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'healthy'
     
     @pytest.mark.integration
-    def test_api_server_calculation(self, api_url):
+    def test_api_server_calculation(self, api_url, api_session):
         """Test API server calculation endpoint."""
-        try:
-            data = {'a': 15, 'b': 7}
-            response = requests.post(f"{api_url}/api/calculate/add", 
-                                   json=data, 
-                                   timeout=5)
-            assert response.status_code == 200
-            result = response.json()
-            assert result['result'] == 22
-        except requests.exceptions.RequestException:
-            pytest.skip("API server is not running")
+        data = {'a': 15, 'b': 7}
+        response = api_session.post(f"{api_url}/api/calculate/add", 
+                                    json=data, 
+                                    timeout=5)
+        assert response.status_code == 200
+        result = response.json()
+        assert result['result'] == 22
+    
+    @pytest.mark.integration
+    def test_api_server_compressed_response(self, api_url, api_session):
+        """Test the live server negotiates response compression."""
+        data = {'numbers': list(range(1000))}
+        response = api_session.post(f"{api_url}/api/calculate/average", 
+                                    json=data, 
+                                    timeout=5)
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.json()['result'] == 499.5
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+"""
+Unit tests for the micro-batching dispatcher.
+"""
+
+import threading
+
+import pytest
+
+from batching import MicroBatcher
+from calculator import Calculator
+from history_index import HistoryIndex
+
+
+def submit_concurrently(batcher, calls):
+    """Submit (operation, a, b) calls from one thread each; return results in call order."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def worker(position, operation, a, b):
+        barrier.wait()
+        try:
+            results[position] = batcher.submit(operation, a, b)
+        except ValueError as e:
+            results[position] = e
+
+    threads = [threading.Thread(target=worker, args=(position,) + call)
+               for position, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestMicroBatcher:
+    """Test collecting concurrent requests into batches."""
+
+    def setup_method(self):
+        """Set up a batcher with a window long enough to gather every thread."""
+        self.calc = Calculator(index=HistoryIndex())
+        self.batcher = MicroBatcher(self.calc, window=0.2, max_batch=64)
+
+    def teardown_method(self):
+        """Stop the dispatcher thread."""
+        self.batcher.close()
+
+    def test_single_request(self):
+        """Test a lone request runs once its window closes."""
+        assert self.batcher.submit('add', 2, 3) == 5
+        assert self.calc.get_history() == ["2 + 3 = 5"]
+        assert self.batcher.stats() == {'requests': 1, 'batches': 1, 'mean_batch_size': 1.0}
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Test concurrent requests run together and each caller gets its own result."""
+        calls = [('add', i, 1) for i in range(10)] + [('multiply', i, 3) for i in range(10)]
+        results = submit_concurrently(self.batcher, calls)
+        assert results == [i + 1 for i in range(10)] + [i * 3 for i in range(10)]
+        assert self.batcher.stats()['requests'] == 20
+        assert self.batcher.stats()['batches'] < 20
+        assert len(self.calc.get_history()) == 20
+        assert self.calc.index.aggregate(op='multiply')['count'] == 10
+
+    def test_max_batch_closes_batch_early(self):
+        """Test a full batch runs without waiting for the window."""
+        batcher = MicroBatcher(self.calc, window=10, max_batch=4)
+        try:
+            results = submit_concurrently(batcher, [('add', i, i) for i in range(8)])
+        finally:
+            batcher.close()
+        assert results == [2 * i for i in range(8)]
+        assert batcher.stats()['batches'] == 2
+
+    def test_zero_window_runs_what_is_queued(self):
+        """Test a zero window batches only requests that are already waiting."""
+        batcher = MicroBatcher(self.calc, window=0)
+        try:
+            assert batcher.submit('subtract', 5, 3) == 2
+        finally:
+            batcher.close()
+
+    def test_errors_reach_every_caller(self):
+        """Test a failing batch raises its error in each waiting caller."""
+        def fail(operation, a_values, b_values):
+            raise ValueError("batch failed")
+
+        self.calc.batch = fail
+        results = submit_concurrently(self.batcher, [('add', 1, 2), ('add', 3, 4)])
+        assert all(isinstance(result, ValueError) for result in results)
+        # The dispatcher keeps serving after a failed batch
+        del self.calc.batch
+        assert self.batcher.submit('add', 1, 1) == 2
+
+    def test_unbatchable_operation(self):
+        """Test operations without a batch form are rejected before queueing."""
+        with pytest.raises(ValueError, match="cannot be batched"):
+            self.batcher.submit('divide', 1, 2)
+        assert self.batcher.stats()['requests'] == 0
+
+    def test_close_restarts_on_next_submit(self):
+        """Test a closed batcher starts a new dispatcher when used again."""
+        assert self.batcher.submit('add', 1, 2) == 3
+        self.batcher.close()
+        assert self.batcher.submit('add', 2, 2) == 4
+
+    def test_invalid_settings(self):
+        """Test negative windows and empty batches are rejected."""
+        with pytest.raises(ValueError, match="window"):
+            MicroBatcher(self.calc, window=-1)
+        with pytest.raises(ValueError, match="batch size"):
+            MicroBatcher(self.calc, max_batch=0)
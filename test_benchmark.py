@@ -0,0 +1,63 @@
+"""
+Test cases for the benchmark harness using pytest.
+"""
+
+import os
+import sys
+
+import pytest
+import benchmark
+from benchmark import find_regressions, load_baseline, measure, save_baseline
+
+
+class TestBenchmarkHarness:
+    """Test benchmark timing, baselines and regression detection."""
+
+    def test_measure_statistics(self):
+        """Test measure returns consistent per-call statistics."""
+        calls = []
+        resets = []
+        stats = measure(lambda: calls.append(1), reset=lambda: resets.append(1),
+                        repeat=3, min_time=0.001, warmup=0.0)
+        assert stats['rounds'] == 3
+        assert stats['loops'] >= 1
+        assert stats['min'] <= stats['median'] <= stats['max']
+        assert stats['stdev'] >= 0
+        assert len(resets) >= 3
+
+    def test_benchmarks_are_runnable(self):
+        """Test every registered benchmark case can be set up and called."""
+        for name, setup in benchmark.BENCHMARKS.items():
+            func, reset = setup()
+            func()
+            if reset:
+                reset()
+
+    def test_baseline_round_trip(self, tmp_path):
+        """Test saving and loading a baseline."""
+        results = {'add': {'min': 1e-7, 'median': 1.1e-7}}
+        path = str(tmp_path / 'baselines' / 'machine.json')
+        save_baseline(results, path)
+        assert load_baseline(path) == results
+
+    def test_missing_baseline(self, tmp_path):
+        """Test loading a baseline that does not exist."""
+        assert load_baseline(str(tmp_path / 'missing.json')) is None
+
+    def test_find_regressions(self):
+        """Test only operations slower than the tolerance are flagged."""
+        baseline = {'add': {'min': 1.0}, 'divide': {'min': 1.0}, 'power': {'min': 1.0}}
+        current = {'add': {'min': 1.2}, 'divide': {'min': 1.5}, 'new': {'min': 9.0}}
+        regressions = find_regressions(baseline, current, tolerance=0.25)
+        assert [item['name'] for item in regressions] == ['divide']
+        assert abs(regressions[0]['slowdown'] - 0.5) < 1e-9
+
+    def test_check_without_baseline_fails(self, tmp_path, monkeypatch, capsys):
+        """Test --check fails instead of passing when there is no baseline."""
+        monkeypatch.setattr(sys, 'argv', ['benchmark.py', '--check', '--filter', 'add',
+                                          '--repeat', '1', '--baseline-dir', str(tmp_path)])
+        with pytest.raises(SystemExit) as exc_info:
+            benchmark.main()
+        assert exc_info.value.code == benchmark.NO_BASELINE_EXIT
+        assert 'nothing to compare against' in capsys.readouterr().out
+        assert os.listdir(tmp_path) == []
@@ -4,6 +4,7 @@ Test cases for the Calculator module using pytest.
 
 import pytest
 from calculator import Calculator, add, subtract, multiply, divide
+from history_index import HistoryIndex
 
 
 class TestCalculator:
@@ -135,6 +136,72 @@ class TestCalculator:
         assert len(self.calc.get_history()) == 0
 
 
+class TestCalculatorIndex:
+    """Test indexing of calculations alongside the history."""
+    
+    def setup_method(self):
+        """Set up a calculator with a history index."""
+        self.calc = Calculator(index=HistoryIndex())
+    
+    def test_results_are_indexed(self):
+        """Test successful calculations are indexed by operation."""
+        self.calc.add(5, 3)
+        self.calc.power(2, 3)
+        assert [record['op'] for record in self.calc.index.query()] == ['add', 'power']
+        assert self.calc.index.query(op='add')[0]['entry'] == "5 + 3 = 8"
+    
+    def test_failures_are_indexed(self):
+        """Test failed calculations are indexed but not added to the history."""
+        with pytest.raises(ValueError):
+            self.calc.divide(1, 0)
+        with pytest.raises(ValueError):
+            self.calc.square_root(-1)
+        assert self.calc.get_history() == []
+        assert self.calc.index.aggregate(op='divide')['errors'] == 1
+        assert self.calc.index.aggregate()['errors'] == 2
+    
+    def test_clear_history_clears_index(self):
+        """Test clearing the history also clears the index."""
+        self.calc.add(1, 2)
+        self.calc.clear_history()
+        assert len(self.calc.index) == 0
+    
+    def test_snapshot_and_restore(self):
+        """Test restoring a snapshot undoes later calculations and clears."""
+        self.calc.add(1, 2)
+        snapshot = self.calc.snapshot()
+        shared = self.calc.history
+        self.calc.multiply(3, 4)
+        with pytest.raises(ValueError):
+            self.calc.divide(1, 0)
+        self.calc.restore(snapshot)
+        assert self.calc.get_history() == ["1 + 2 = 3"]
+        assert self.calc.index.aggregate()['count'] == 1
+        assert self.calc.index.aggregate()['errors'] == 0
+        
+        self.calc.clear_history()
+        self.calc.restore(snapshot)
+        assert self.calc.get_history() == ["1 + 2 = 3"]
+        # Restored in place, so anything sharing the history list sees it
+        assert self.calc.history is shared
+    
+    def test_batch_records_each_pair(self):
+        """Test a batch gives the same results, history and index as single calls."""
+        single = Calculator(index=HistoryIndex())
+        expected = [single.add(1, 2), single.add(2.5, -1)]
+        assert self.calc.batch('add', [1, 2.5], [2, -1]) == expected
+        assert self.calc.get_history() == single.get_history()
+        assert self.calc.index.aggregate(op='add') == single.index.aggregate(op='add')
+    
+    def test_batch_validation(self):
+        """Test unbatchable operations and mismatched operand lists are rejected."""
+        with pytest.raises(ValueError, match="cannot be batched"):
+            self.calc.batch('divide', [1], [2])
+        with pytest.raises(ValueError, match="same length"):
+            self.calc.batch('multiply', [1, 2], [3])
+        assert self.calc.get_history() == []
+
+
 class TestStandaloneFunctions:
     """Test class for standalone calculator functions."""
     
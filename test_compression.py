@@ -0,0 +1,179 @@
+"""
+Test cases for the HTTP compression module using pytest.
+"""
+
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+from compression import DecompressedSizeError, compress, compress_stream, decompress, init_compression
+
+
+@pytest.fixture
+def client():
+    """Create a test client for a small app with compression enabled."""
+    app = Flask(__name__)
+    init_compression(app)
+    app.config['TESTING'] = True
+    app.config['COMPRESS_MIN_SIZE'] = 100
+
+    @app.route('/small')
+    def small():
+        return jsonify({'value': 1})
+
+    @app.route('/large')
+    def large():
+        return jsonify({'values': list(range(1000))})
+
+    @app.route('/stream')
+    def stream():
+        return Response((json.dumps({'row': i}) + '\n' for i in range(1000)), mimetype='text/plain')
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify(request.get_json())
+
+    with app.test_client() as client:
+        yield client
+
+
+class TestCompressionFunctions:
+    """Test compression helper functions."""
+
+    def test_gzip_round_trip(self):
+        """Test gzip compression produces standard gzip data."""
+        data = b'x' * 10000
+        assert gzip.decompress(compress(data, 'gzip', 6)) == data
+
+    def test_deflate_round_trip(self):
+        """Test deflate compression produces zlib-wrapped data."""
+        data = b'y' * 10000
+        assert zlib.decompress(compress(data, 'deflate', 1)) == data
+
+    def test_compress_stream(self):
+        """Test incremental compression of a chunked body."""
+        chunks = [b'chunk %d\n' % i for i in range(500)]
+        compressed = b''.join(compress_stream(iter(chunks), 'gzip', 6))
+        assert gzip.decompress(compressed) == b''.join(chunks)
+
+    def test_compress_stream_emits_each_chunk(self):
+        """Test each chunk is decodable before the input is exhausted."""
+        produced = []
+
+        def chunks():
+            for i in range(3):
+                produced.append(i)
+                yield b'chunk %d\n' % i
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        stream = compress_stream(chunks(), 'gzip', 6)
+        for i in range(3):
+            assert decompressor.decompress(next(stream)) == b'chunk %d\n' % i
+            assert produced == list(range(i + 1))
+
+    def test_decompress_size_limit(self):
+        """Test decompression refuses bodies that expand beyond the limit."""
+        with pytest.raises(DecompressedSizeError):
+            decompress(gzip.compress(b'0' * 10000), 'gzip', 1000)
+
+    def test_decompress_invalid_data(self):
+        """Test decompression of corrupt data raises error."""
+        with pytest.raises(ValueError, match="Invalid gzip"):
+            decompress(b'not gzip', 'gzip', 1000)
+
+
+class TestResponseCompression:
+    """Test negotiated response compression."""
+
+    def test_large_response_gzip(self, client):
+        """Test large responses are gzip compressed when accepted."""
+        response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert json.loads(gzip.decompress(response.data))['values'][-1] == 999
+
+    def test_large_response_deflate(self, client):
+        """Test deflate is used when it is the only accepted encoding."""
+        response = client.get('/large', headers={'Accept-Encoding': 'deflate'})
+        assert response.headers['Content-Encoding'] == 'deflate'
+        assert json.loads(zlib.decompress(response.data))['values'][0] == 0
+
+    def test_small_response_not_compressed(self, client):
+        """Test responses below the threshold are sent as-is."""
+        response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert json.loads(response.data) == {'value': 1}
+
+    def test_no_accept_encoding(self, client):
+        """Test responses are not compressed without Accept-Encoding."""
+        response = client.get('/large')
+        assert 'Content-Encoding' not in response.headers
+
+    def test_rejected_encoding(self, client):
+        """Test encodings with q=0 are not used."""
+        response = client.get('/large', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_response(self, client):
+        """Test chunked responses are compressed incrementally."""
+        response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data).count(b'\n') == 1000
+
+
+class TestRequestDecompression:
+    """Test compressed request bodies."""
+
+    def test_gzip_request_body(self, client):
+        """Test gzip compressed JSON bodies are decompressed."""
+        body = gzip.compress(json.dumps({'a': 5}).encode())
+        response = client.post('/echo', data=body, content_type='application/json',
+                               headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert json.loads(response.data) == {'a': 5}
+
+    def test_unsupported_request_encoding(self, client):
+        """Test unsupported request encodings are rejected."""
+        response = client.post('/echo', data=b'{}', content_type='application/json',
+                               headers={'Content-Encoding': 'br'})
+        assert response.status_code == 415
+
+    def test_corrupt_request_body(self, client):
+        """Test corrupt compressed bodies are rejected."""
+        response = client.post('/echo', data=b'garbage', content_type='application/json',
+                               headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+    def test_request_body_too_large(self, client):
+        """Test compressed bodies that expand too far are rejected."""
+        client.application.config['COMPRESS_MAX_REQUEST_SIZE'] = 100
+        body = gzip.compress(json.dumps({'a': 'x' * 1000}).encode())
+        response = client.post('/echo', data=body, content_type='application/json',
+                               headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 413
+    
+    def test_compressed_body_too_large(self, client):
+        """Test compressed bodies over MAX_CONTENT_LENGTH are rejected before decompressing."""
+        client.application.config['MAX_CONTENT_LENGTH'] = 100
+        body = zlib.compress(bytes(range(256)) * 4)
+        response = client.post('/echo', data=body, content_type='application/json',
+                               headers={'Content-Encoding': 'deflate'})
+        assert response.status_code == 413
+        assert 'Compressed request body exceeds 100 bytes' in json.loads(response.data)['error']
+    
+    def test_compressed_body_limit_without_content_length(self, client):
+        """Test the cap also holds for bodies sent without a Content-Length."""
+        client.application.config['COMPRESS_MAX_REQUEST_SIZE'] = 100
+        body = zlib.compress(bytes(range(256)) * 4)
+        # A chunked upload: no Content-Length, and the server marks the input as terminated
+        response = client.post('/echo', input_stream=io.BytesIO(body),
+                               content_type='application/json', headers={'Content-Encoding': 'deflate'},
+                               environ_overrides={'wsgi.input_terminated': True})
+        assert response.status_code == 413
+        assert 'Compressed request body exceeds 100 bytes' in json.loads(response.data)['error']
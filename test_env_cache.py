@@ -0,0 +1,147 @@
+"""
+Test cases for the environment cache module using pytest.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+import env_cache
+from env_cache import COMPLETE_MARKER, ensure_environment, environment_key
+
+
+class TestEnvironmentCache:
+    """Test environment keys and cached environment reuse."""
+
+    def test_key_depends_on_requirements(self, tmp_path):
+        """Test the key changes only when requirements change."""
+        requirements = tmp_path / 'requirements.txt'
+        requirements.write_text('Flask==2.3.3\n')
+        first = environment_key(str(requirements))
+        assert environment_key(str(requirements)) == first
+        requirements.write_text('Flask==2.3.3\nrequests==2.31.0\n')
+        assert environment_key(str(requirements)) != first
+
+    def test_key_depends_on_interpreter(self, tmp_path, monkeypatch):
+        """Test the key changes with the interpreter."""
+        requirements = tmp_path / 'requirements.txt'
+        requirements.write_text('Flask==2.3.3\n')
+        first = environment_key(str(requirements))
+        monkeypatch.setattr(env_cache, 'interpreter_tag', lambda: 'cpython-2.7.18-linux-x86_64')
+        assert environment_key(str(requirements)) != first
+
+    def test_reuses_complete_environment(self, tmp_path, monkeypatch):
+        """Test a complete cached environment is linked without running any setup."""
+        requirements = tmp_path / 'requirements.txt'
+        requirements.write_text('Flask==2.3.3\n')
+        root = tmp_path / 'cache'
+        env_dir = root / 'venvs' / environment_key(str(requirements))
+        env_dir.mkdir(parents=True)
+        (env_dir / COMPLETE_MARKER).write_text('{}')
+
+        def fail(*args, **kwargs):
+            raise AssertionError("environment should not be rebuilt")
+
+        monkeypatch.setattr(env_cache, '_run', fail)
+        link = tmp_path / 'venv'
+        link.mkdir()
+        (link / 'stale').write_text('old venv')
+
+        assert ensure_environment(str(requirements), link=str(link), root=str(root)) == str(env_dir)
+        assert os.path.islink(link)
+        assert os.readlink(link) == str(env_dir)
+        # The unmanaged venv is moved aside, not deleted
+        moved = [path for path in tmp_path.iterdir() if path.name.startswith('venv.unmanaged-')]
+        assert [(path / 'stale').read_text() for path in moved] == ['old venv']
+        # A second call keeps the existing link
+        ensure_environment(str(requirements), link=str(link), root=str(root))
+        assert os.readlink(link) == str(env_dir)
+
+
+@pytest.fixture
+def fake_setup(monkeypatch):
+    """Replace venv creation and pip with a slow no-op that records calls."""
+    calls = []
+
+    def run(command, description):
+        calls.append(description)
+        time.sleep(0.05)
+
+    monkeypatch.setattr(env_cache, '_run', run)
+    return calls
+
+
+class TestEnvironmentBuilds:
+    """Test building, rebuilding and concurrent use of cached environments."""
+
+    @pytest.fixture
+    def requirements(self, tmp_path):
+        path = tmp_path / 'requirements.txt'
+        path.write_text('Flask==2.3.3\n')
+        return str(path)
+
+    def test_build_swaps_current_link(self, tmp_path, requirements, fake_setup):
+        """Test a build lands in its own directory behind the key's link."""
+        root = tmp_path / 'cache'
+        env_dir = ensure_environment(requirements, link=str(tmp_path / 'venv'), root=str(root))
+        current = root / 'venvs' / environment_key(requirements)
+
+        assert os.readlink(current) == env_dir
+        assert os.readlink(tmp_path / 'venv') == env_dir
+        assert os.path.exists(os.path.join(env_dir, COMPLETE_MARKER))
+        assert fake_setup == ['Creating virtual environment', 'Building wheel cache',
+                              'Installing dependencies from wheel cache']
+
+    def test_rebuild_keeps_environment_in_use(self, tmp_path, requirements, fake_setup):
+        """Test a rebuild leaves the previous build in place for jobs using it."""
+        root = str(tmp_path / 'cache')
+        old = ensure_environment(requirements, link=str(tmp_path / 'job-a'), root=root)
+        new = ensure_environment(requirements, link=str(tmp_path / 'job-b'), root=root, rebuild=True)
+
+        assert new != old
+        assert os.path.exists(os.path.join(old, COMPLETE_MARKER))
+        assert os.readlink(tmp_path / 'job-a') == old
+        # The wheel cache is reused rather than rebuilt
+        assert fake_setup.count('Building wheel cache') == 1
+
+    def test_failed_build_leaves_no_partial_environment(self, tmp_path, requirements, monkeypatch):
+        """Test a failed build is removed and the key is not marked complete."""
+        def fail(command, description):
+            if description.startswith('Installing'):
+                raise RuntimeError(f"{description} failed")
+
+        monkeypatch.setattr(env_cache, '_run', fail)
+        root = tmp_path / 'cache'
+        with pytest.raises(RuntimeError):
+            ensure_environment(requirements, link=str(tmp_path / 'venv'), root=str(root))
+
+        assert os.listdir(root / 'venvs') == []
+        assert not os.path.exists(tmp_path / 'venv')
+
+    def test_concurrent_jobs_build_once(self, tmp_path, requirements, fake_setup):
+        """Test jobs racing on one key wait for a single build and share it."""
+        root = str(tmp_path / 'cache')
+        results = []
+        jobs = [threading.Thread(target=lambda i=i: results.append(
+                    ensure_environment(requirements, link=str(tmp_path / f'job-{i}'), root=root)))
+                for i in range(3)]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+
+        assert len(results) == 3 and len(set(results)) == 1
+        assert fake_setup.count('Creating virtual environment') == 1
+
+    def test_prune_removes_only_stale_builds(self, tmp_path):
+        """Test superseded builds are pruned after they go stale."""
+        venv_root = tmp_path / 'venvs'
+        for name in ('abc-old', 'abc-recent', 'abc-current', 'xyz-old'):
+            (venv_root / name).mkdir(parents=True)
+        stale = time.time() - env_cache.STALE_BUILD_SECONDS - 60
+        for name in ('abc-old', 'abc-current', 'xyz-old'):
+            os.utime(venv_root / name, (stale, stale))
+
+        env_cache.prune_builds(str(venv_root), 'abc', keep=str(venv_root / 'abc-current'))
+        assert sorted(os.listdir(venv_root)) == ['abc-current', 'abc-recent', 'xyz-old']
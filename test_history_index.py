@@ -0,0 +1,228 @@
+"""
+Test cases for the history index using pytest.
+"""
+
+import random
+import sys
+import threading
+
+import pytest
+from history_index import HistoryIndex
+
+
+class FakeClock:
+    """Clock advanced manually by tests."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def index(clock):
+    """Index with 10 second buckets and a few records a second apart."""
+    index = HistoryIndex(bucket_seconds=10, clock=clock)
+    for op, result in [('add', 3), ('divide', 2.5), ('add', 7), ('divide', None), ('power', 8)]:
+        if result is None:
+            index.record(op, error='Cannot divide by zero')
+        else:
+            index.record(op, result, entry=f"{op} = {result}")
+        clock.now += 1
+    return index
+
+
+def brute_force(index, op=None, start=None, end=None):
+    """Aggregate by scanning every kept record."""
+    records = [record for record in index.snapshot()
+               if (op is None or record['op'] == op)
+               and (start is None or record['timestamp'] >= start)
+               and (end is None or record['timestamp'] < end)]
+    results = [record['result'] for record in records if record['status'] == 'ok']
+    return len(results), len(records) - len(results), sum(results)
+
+
+class TestHistoryQuery:
+    """Test filtering indexed records."""
+
+    def test_query_by_operation(self, index):
+        """Test records are filtered by operation, oldest first."""
+        assert [record['result'] for record in index.query(op='add')] == [3.0, 7.0]
+        assert index.query(op='sqrt') == []
+
+    def test_query_by_time_range(self, index):
+        """Test the time range includes start and excludes end."""
+        records = index.query(start=1001, end=1003)
+        assert [record['op'] for record in records] == ['divide', 'add']
+
+    def test_query_by_result_range(self, index):
+        """Test the result range is inclusive and skips failures."""
+        records = index.query(min_result=3, max_result=8)
+        assert [record['result'] for record in records] == [3.0, 7.0, 8.0]
+
+    def test_query_by_status(self, index):
+        """Test failed calculations can be selected."""
+        records = index.query(status='error')
+        assert [(record['op'], record['error']) for record in records] == [('divide', 'Cannot divide by zero')]
+        with pytest.raises(ValueError, match="Unknown status"):
+            index.query(status='broken')
+
+    def test_query_limit_keeps_most_recent(self, index):
+        """Test a limit returns the most recent matches."""
+        assert [record['op'] for record in index.query(limit=2)] == ['divide', 'power']
+
+    def test_snapshot_restore(self, index, clock):
+        """Test restoring a snapshot rebuilds records, indexes and aggregates."""
+        snapshot = index.snapshot()
+        before = index.aggregate(op='add', start=1000, end=1003)
+        index.record('add', 100)
+        index.clear()
+        index.restore(snapshot)
+        assert len(index) == 5
+        assert index.aggregate(op='add', start=1000, end=1003) == before
+        assert [record['op'] for record in index.query(status='error')] == ['divide']
+
+    def test_clear(self, index):
+        """Test clearing removes records and aggregates."""
+        index.clear()
+        assert len(index) == 0
+        assert index.aggregate()['count'] == 0
+
+
+class TestHistoryAggregate:
+    """Test running and time-bucketed aggregates."""
+
+    def test_running_totals(self, index):
+        """Test aggregates per operation and across operations."""
+        assert index.aggregate(op='add') == {'count': 2, 'errors': 0, 'sum': 10.0,
+                                             'mean': 5.0, 'min': 3.0, 'max': 7.0}
+        assert index.aggregate(op='divide')['errors'] == 1
+        totals = index.aggregate()
+        assert (totals['count'], totals['errors'], totals['sum']) == (4, 1, 20.5)
+
+    def test_empty_aggregate(self, index):
+        """Test aggregates of nothing have no mean, min or max."""
+        assert index.aggregate(op='sqrt') == {'count': 0, 'errors': 0, 'sum': 0.0,
+                                              'mean': None, 'min': None, 'max': None}
+
+    def test_result_range_aggregate(self, index):
+        """Test aggregates restricted to a result range."""
+        result = index.aggregate(min_result=5)
+        assert (result['count'], result['sum']) == (2, 15.0)
+
+    def test_time_range_matches_scan(self, clock):
+        """Test bucketed aggregates agree with a full scan for arbitrary ranges."""
+        rng = random.Random(1)
+        index = HistoryIndex(bucket_seconds=10, clock=clock)
+        for _ in range(2000):
+            clock.now += rng.random()
+            op = rng.choice(['add', 'divide'])
+            if rng.random() < 0.1:
+                index.record(op, error='failed')
+            else:
+                index.record(op, rng.uniform(-5, 5))
+
+        for _ in range(500):
+            start = rng.choice([None, rng.uniform(990, 2010)])
+            end = rng.choice([None, rng.uniform(990, 2010)])
+            op = rng.choice([None, 'add', 'divide', 'power'])
+            result = index.aggregate(op, start, end)
+            count, errors, total = brute_force(index, op, start, end)
+            assert (result['count'], result['errors']) == (count, errors)
+            assert result['sum'] == pytest.approx(total)
+
+    def test_capacity_keeps_most_recent(self, clock):
+        """Test a capped index evicts the oldest records from queries and aggregates."""
+        rng = random.Random(2)
+        index = HistoryIndex(bucket_seconds=10, clock=clock, capacity=300)
+        for count in range(1, 1001):
+            # Repeated timestamps put evicted and kept records in one bucket
+            clock.now += rng.choice([0, 0, rng.random()])
+            op = rng.choice(['add', 'divide'])
+            if rng.random() < 0.1:
+                index.record(op, error='failed')
+            else:
+                index.record(op, rng.uniform(-5, 5))
+            if count % 37:
+                continue
+            assert len(index) == min(count, 300)
+            assert [record['id'] for record in index.query()] == list(range(max(0, count - 300), count))
+            for _ in range(20):
+                start = rng.choice([None, rng.uniform(990, clock.now + 1)])
+                end = rng.choice([None, rng.uniform(990, clock.now + 1)])
+                op = rng.choice([None, 'add', 'divide'])
+                result = index.aggregate(op, start, end)
+                expected_count, errors, total = brute_force(index, op, start, end)
+                assert (result['count'], result['errors']) == (expected_count, errors)
+                assert result['sum'] == pytest.approx(total)
+
+        snapshot = index.snapshot()
+        restored = HistoryIndex(bucket_seconds=10, clock=clock, capacity=300)
+        restored.restore(snapshot)
+        assert restored.query() == index.query()
+        assert restored.aggregate() == pytest.approx(index.aggregate())
+
+    def test_invalid_capacity(self):
+        """Test capacity must be positive."""
+        with pytest.raises(ValueError, match="Capacity"):
+            HistoryIndex(capacity=0)
+
+    def test_clock_stepping_back_keeps_order(self, clock):
+        """Test records stay in time order if the clock steps backwards."""
+        index = HistoryIndex(bucket_seconds=10, clock=clock)
+        index.record('add', 1)
+        clock.now -= 5
+        index.record('add', 2)
+        assert index.records[1]['timestamp'] == index.records[0]['timestamp']
+
+    def test_unrepresentable_results(self, clock):
+        """Test huge and complex results do not break aggregates."""
+        index = HistoryIndex(clock=clock)
+        index.record('factorial', 10 ** 400)
+        index.record('power', complex(1, 1))
+        assert index.aggregate(op='factorial')['max'] == float('inf')
+        assert index.aggregate(op='power')['count'] == 0
+        assert len(index.query(op='power')) == 1
+
+    def test_invalid_bucket_width(self):
+        """Test bucket width must be positive."""
+        with pytest.raises(ValueError, match="Bucket width"):
+            HistoryIndex(bucket_seconds=0)
+
+
+class TestHistoryIndexThreads:
+    """Test concurrent use of one index."""
+
+    def test_concurrent_records(self):
+        """Test records from many threads get unique ids and land under their own operation."""
+        # Switch threads as often as possible to expose unlocked updates
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        index = HistoryIndex()
+        ops = ['add', 'multiply', 'divide', 'power']
+
+        def worker(op):
+            for i in range(10000):
+                index.record(op, i)
+                if i % 100 == 0:
+                    index.aggregate(op=op, start=0)
+
+        threads = [threading.Thread(target=worker, args=(op,)) for op in ops]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert [record['id'] for record in index.query()] == list(range(40000))
+        for op in ops:
+            assert {record['op'] for record in index.query(op=op)} == {op}
+            assert index.aggregate(op=op)['count'] == 10000
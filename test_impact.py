@@ -0,0 +1,77 @@
+"""
+Test cases for the test impact analysis module using pytest.
+"""
+
+import subprocess
+
+import pytest
+from impact import ALL_TESTS, changed_lines, select_tests, store_blob
+
+
+MODULE = "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n"
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Create a scratch git repository with a module and a test file."""
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    (tmp_path / 'mod.py').write_text(MODULE)
+    (tmp_path / 'test_mod.py').write_text("def test_add(): pass\n")
+    (tmp_path / 'pytest.ini').write_text("[pytest]\n")
+    return tmp_path
+
+
+def make_index():
+    """Index where test_add covers line 2 and test_sub covers line 6."""
+    return {
+        'version': 1,
+        'tests': ['test_mod.py::test_add', 'test_mod.py::test_sub'],
+        'coverage': {'mod.py': {'1': [], '2': [0], '5': [], '6': [1]}},
+        'blobs': {'mod.py': store_blob('mod.py'), 'test_mod.py': store_blob('test_mod.py')},
+        'config': {'pytest.ini': store_blob('pytest.ini')},
+    }
+
+
+class TestImpactAnalysis:
+    """Test changed-line detection and test selection."""
+
+    def test_changed_lines(self, repo):
+        """Test modified and inserted lines are reported against the old version."""
+        old = store_blob('mod.py')
+        (repo / 'mod.py').write_text(MODULE.replace('a - b', 'b - a'))
+        assert changed_lines(old, store_blob('mod.py')) == {6}
+        (repo / 'mod.py').write_text(MODULE + "# trailing\n")
+        assert changed_lines(old, store_blob('mod.py')) == {6, 7}
+
+    def test_no_changes(self, repo):
+        """Test nothing is selected when nothing changed."""
+        assert select_tests(make_index()) == []
+
+    def test_selects_tests_covering_changed_lines(self, repo):
+        """Test only tests covering a changed line are selected."""
+        index = make_index()
+        (repo / 'mod.py').write_text(MODULE.replace('a - b', 'b - a'))
+        assert select_tests(index) == ['test_mod.py::test_sub']
+
+    def test_import_time_change_selects_all_users(self, repo):
+        """Test changing a line no test covers selects every test using the file."""
+        index = make_index()
+        (repo / 'mod.py').write_text(MODULE.replace('def sub(a, b)', 'def sub(a, b=0)'))
+        assert select_tests(index) == ['test_mod.py::test_add', 'test_mod.py::test_sub']
+
+    def test_changed_test_file_runs_whole_file(self, repo):
+        """Test a changed test file is run in full."""
+        index = make_index()
+        (repo / 'test_mod.py').write_text("def test_add(): pass\ndef test_new(): pass\n")
+        assert select_tests(index) == ['test_mod.py']
+
+    def test_stale_index_runs_everything(self, repo):
+        """Test config changes, new modules and a missing index fall back to the full suite."""
+        assert select_tests(None) is ALL_TESTS
+        index = make_index()
+        (repo / 'helper.py').write_text("X = 1\n")
+        assert select_tests(index) is ALL_TESTS
+        (repo / 'helper.py').unlink()
+        (repo / 'pytest.ini').write_text("[pytest]\naddopts = -x\n")
+        assert select_tests(index) is ALL_TESTS
@@ -0,0 +1,62 @@
+"""
+Test cases for cold-start import time using pytest.
+"""
+
+import subprocess
+import sys
+
+import pytest
+from import_profile import IMPORT_BUDGETS_MS, budget_ms, direct_imports, parse_importtime, profile_import
+
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:        50 |         50 |     _weakref
+import time:       200 |        250 |   weakref
+import time:       300 |        300 |   math
+import time:       400 |        950 | calculator
+"""
+
+
+class TestImportProfile:
+    """Test parsing of -X importtime output."""
+
+    def test_parse_importtime(self):
+        """Test entries, times and nesting depth are parsed."""
+        entries = parse_importtime(SAMPLE)
+        assert [entry['name'] for entry in entries] == ['site', '_weakref', 'weakref', 'math', 'calculator']
+        assert [entry['depth'] for entry in entries] == [0, 2, 1, 1, 0]
+        assert entries[-1]['cumulative_us'] == 950
+
+    def test_direct_imports(self):
+        """Test only the module's direct imports are returned."""
+        names = [entry['name'] for entry in direct_imports(parse_importtime(SAMPLE), 'calculator')]
+        assert sorted(names) == ['math', 'weakref']
+
+
+class TestStartupBudget:
+    """Test cold-start import time and laziness of the project modules."""
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+    def test_import_within_budget(self, module):
+        """
+        Test each module imports within its cold-start budget.
+
+        Wall-clock budgets fail on loaded machines (e.g. during --workers
+        runs), so this only runs with --run-slow; CI checks the budgets with
+        `python import_profile.py --check` in its own stage.
+        """
+        profile = profile_import(module, runs=3)
+        assert profile['total_us'] > 0
+        assert profile['total_us'] / 1000 <= budget_ms(module), \
+            f"{module} took {profile['total_us'] / 1000:.1f} ms to import"
+
+    def test_api_import_is_lazy(self):
+        """Test importing the API builds no app and does not import NumPy."""
+        code = ("import sys, api_simulator; "
+                "assert api_simulator._default_app is None; "
+                "assert 'numpy' not in sys.modules; "
+                "import calculator, logging; "
+                "assert not logging.getLogger().handlers")
+        subprocess.run([sys.executable, '-c', code], check=True)
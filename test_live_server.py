@@ -0,0 +1,49 @@
+"""
+Test cases for the live server helpers using pytest.
+"""
+
+import pytest
+import requests
+from flask import Flask, jsonify
+
+from live_server import LiveServer, make_session, wait_until_ready
+
+
+def make_app():
+    """Create a minimal app with a health endpoint."""
+    app = Flask(__name__)
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'healthy'})
+
+    return app
+
+
+class TestLiveServer:
+    """Test starting and stopping a live server."""
+
+    def test_serves_on_ephemeral_port(self):
+        """Test two servers get distinct free ports and answer requests."""
+        with LiveServer(make_app()) as first, LiveServer(make_app()) as second:
+            assert first.port != 0
+            assert first.port != second.port
+            session = make_session()
+            assert session.get(f"{first.url}/health", timeout=5).json() == {'status': 'healthy'}
+            assert session.get(f"{second.url}/health", timeout=5).status_code == 200
+            session.close()
+
+    def test_stop_closes_port(self):
+        """Test the server stops accepting connections after stop()."""
+        server = LiveServer(make_app()).start()
+        url = server.url
+        server.stop()
+        with pytest.raises(requests.ConnectionError):
+            requests.get(f"{url}/health", timeout=1)
+
+    def test_wait_until_ready_timeout(self):
+        """Test waiting for a server that never starts raises error."""
+        with LiveServer(make_app()) as server:
+            url = server.url
+        with pytest.raises(RuntimeError, match="did not become ready"):
+            wait_until_ready(url, timeout=0.2)
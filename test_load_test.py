@@ -0,0 +1,51 @@
+"""
+Test cases for the load test helpers using pytest.
+"""
+
+import pytest
+from load_test import compare_reports, latency_summary, parse_mix, percentile
+
+
+class TestLoadTestHelpers:
+    """Test load test report helpers."""
+
+    def test_parse_mix(self):
+        """Test parsing an operation mix."""
+        assert parse_mix('add=4, divide=1,health') == {'add': 4.0, 'divide': 1.0, 'health': 1.0}
+
+    def test_parse_mix_unknown_operation(self):
+        """Test an unknown operation in the mix raises error."""
+        with pytest.raises(ValueError, match="Unknown operation"):
+            parse_mix('add=1,modulo=2')
+
+    def test_parse_mix_zero_weight(self):
+        """Test a mix without positive weights raises error."""
+        with pytest.raises(ValueError, match="positive total weight"):
+            parse_mix('add=0')
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([], 50) == 0.0
+
+    def test_latency_summary(self):
+        """Test latency summaries are reported in milliseconds."""
+        summary = latency_summary([0.003, 0.001, 0.002])
+        assert summary['count'] == 3
+        assert summary['p50_ms'] == pytest.approx(2.0)
+        assert summary['max_ms'] == pytest.approx(3.0)
+        assert summary['mean_ms'] == pytest.approx(2.0)
+
+    def test_compare_reports(self):
+        """Test comparing two reports."""
+        latency = {'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'max_ms': 40.0}
+        baseline = {'throughput_rps': 100.0, 'latency': latency}
+        current = {'throughput_rps': 150.0, 'latency': dict(latency, p99_ms=15.0)}
+        comparison = compare_reports(baseline, current)
+        assert comparison['throughput_rps']['change_pct'] == pytest.approx(50.0)
+        assert comparison['p99_ms']['change_pct'] == pytest.approx(-50.0)
+        assert comparison['p50_ms']['change_pct'] == 0.0
@@ -0,0 +1,186 @@
+"""
+Test cases for the test sharding module using pytest.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+import sharding
+from sharding import (durations_from_junit, junit_key, merge_junit_xml, merge_shards, parse_shard, partition,
+                      plan_id, shard_paths)
+
+SHARDING_SCRIPT = os.path.abspath(sharding.__file__)
+
+
+JUNIT_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="0" failures="{failures}" skipped="0" tests="{tests}" time="{time}">
+{cases}
+</testsuite></testsuites>
+"""
+
+
+def write_junit(path, cases, failures=0):
+    """Write a minimal pytest-style JUnit XML report."""
+    body = '\n'.join(f'<testcase classname="{classname}" name="{name}" time="{time}" />'
+                     for classname, name, time in cases)
+    path.write_text(JUNIT_TEMPLATE.format(failures=failures, tests=len(cases),
+                                          time=sum(case[2] for case in cases), cases=body))
+    return str(path)
+
+
+class TestPartition:
+    """Test duration-balanced partitioning."""
+
+    def test_junit_key(self):
+        """Test node ids map onto JUnit classname/name keys."""
+        assert junit_key('test_api.py::TestAPIHealth::test_health_check') == \
+            'test_api.TestAPIHealth::test_health_check'
+        assert junit_key('tests/test_x.py::test_fn[1-2]') == 'tests.test_x::test_fn[1-2]'
+
+    def test_balances_by_duration(self):
+        """Test long tests are spread across shards."""
+        node_ids = [f'test_a.py::test_{i}' for i in range(6)]
+        durations = {'test_a::test_0': 5.0, 'test_a::test_1': 5.0,
+                     'test_a::test_2': 1.0, 'test_a::test_3': 1.0,
+                     'test_a::test_4': 1.0, 'test_a::test_5': 1.0}
+        shards = partition(node_ids, 2, durations)
+        totals = [sum(durations[junit_key(n)] for n in shard) for shard in shards]
+        assert totals == [7.0, 7.0]
+
+    def test_covers_every_test_once_in_order(self):
+        """Test every test lands in exactly one shard, keeping collection order."""
+        node_ids = [f'test_a.py::test_{i}' for i in range(10)]
+        shards = partition(node_ids, 3)
+        assert sorted(n for shard in shards for n in shard) == sorted(node_ids)
+        for shard in shards:
+            assert shard == sorted(shard, key=node_ids.index)
+
+    def test_deterministic(self):
+        """Test partitioning is deterministic."""
+        node_ids = [f'test_a.py::test_{i}' for i in range(20)]
+        assert partition(node_ids, 4) == partition(node_ids, 4)
+
+    def test_invalid_shard_count(self):
+        """Test a shard count below one raises error."""
+        with pytest.raises(ValueError):
+            partition(['test_a.py::test_0'], 0)
+
+
+class TestReportMerging:
+    """Test JUnit XML merging and duration extraction."""
+
+    def test_merge_junit_xml(self, tmp_path):
+        """Test reports are merged into a single suite with summed totals."""
+        first = write_junit(tmp_path / 'a.xml', [('test_a', 'test_1', 0.5)])
+        second = write_junit(tmp_path / 'b.xml', [('test_b', 'test_2', 1.0), ('test_b', 'test_3', 0.25)],
+                             failures=1)
+        output = str(tmp_path / 'out' / 'junit.xml')
+        totals = merge_junit_xml([first, second], output)
+        assert totals['tests'] == 3
+        assert totals['failures'] == 1
+        suite = ET.parse(output).getroot().find('testsuite')
+        assert suite.get('tests') == '3'
+        assert len(suite.findall('testcase')) == 3
+
+    def test_durations_from_junit(self, tmp_path):
+        """Test durations are read back under their JUnit keys."""
+        report = write_junit(tmp_path / 'a.xml', [('test_api.TestAPIHealth', 'test_health_check', 0.5)])
+        assert durations_from_junit([report]) == {'test_api.TestAPIHealth::test_health_check': 0.5}
+
+
+def write_manifest(directory, index, count, tests, plan='plan-a'):
+    """Write a shard manifest as run_shard does."""
+    path = shard_paths(index, count, str(directory))['manifest']
+    os.makedirs(str(directory), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'index': index, 'count': count, 'plan': plan, 'tests': tests}, f)
+
+
+class TestShardSpec:
+    """Test shard specs and plan fingerprints."""
+
+    def test_parse_shard(self):
+        """Test i/N specs are parsed and validated."""
+        assert parse_shard('2/4') == (2, 4)
+        for spec in ('0/4', '5/4', '1/0', 'two/4', '3'):
+            with pytest.raises(ValueError, match="Invalid shard"):
+                parse_shard(spec)
+
+    def test_plan_id_detects_different_partitions(self):
+        """Test partitions from different durations get different fingerprints."""
+        node_ids = [f'test_a.py::test_{i}' for i in range(6)]
+        plan = plan_id(partition(node_ids, 2))
+        assert plan == plan_id(partition(list(node_ids), 2))
+        durations = {junit_key(node_id): 1.0 for node_id in node_ids}
+        durations['test_a::test_0'] = 10.0
+        assert plan != plan_id(partition(node_ids, 2, durations))
+
+
+class TestShardMerging:
+    """Test validation when merging shard results."""
+
+    def test_missing_shard(self, tmp_path):
+        """Test merging fails when a shard has not reported."""
+        write_manifest(tmp_path, 1, 3, [])
+        write_manifest(tmp_path, 3, 3, [])
+        with pytest.raises(ValueError, match="Missing results for shard\\(s\\) 2/3"):
+            merge_shards(str(tmp_path), str(tmp_path / 'junit.xml'), str(tmp_path / 'durations.json'))
+
+    def test_inconsistent_plans(self, tmp_path):
+        """Test merging fails when agents partitioned the suite differently."""
+        write_manifest(tmp_path, 1, 2, [], plan='plan-a')
+        write_manifest(tmp_path, 2, 2, [], plan='plan-b')
+        with pytest.raises(ValueError, match="partitioned differently"):
+            merge_shards(str(tmp_path), str(tmp_path / 'junit.xml'), str(tmp_path / 'durations.json'))
+
+    def test_no_shards(self, tmp_path):
+        """Test merging an empty directory fails."""
+        with pytest.raises(ValueError, match="No shard manifests"):
+            merge_shards(str(tmp_path))
+
+
+class TestShardProcesses:
+    """Run a small suite as separate shard processes, like build agents, and merge it."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """A tiny project with a module and a few test files."""
+        (tmp_path / 'mod.py').write_text('def double(x):\n    return 2 * x\n\n\ndef half(x):\n    return x / 2\n')
+        for name in ('a', 'b', 'c'):
+            cases = '\n'.join(f'def test_{name}_{i}():\n    assert mod.double({i}) == {2 * i}\n'
+                               for i in range(4))
+            (tmp_path / f'test_{name}.py').write_text(f'import mod\n\n\n{cases}')
+        return tmp_path
+
+    def run_shards(self, project, count):
+        processes = [subprocess.Popen([sys.executable, SHARDING_SCRIPT, 'run', f'{index}/{count}', '--cov', 'mod'],
+                                      cwd=str(project), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                     for index in range(1, count + 1)]
+        for process in processes:
+            output, _ = process.communicate()
+            assert process.returncode == 0, output.decode()
+
+    def test_shards_cover_suite_once_and_merge(self, project):
+        """Test shards run disjoint parts of the suite and merge into single reports."""
+        self.run_shards(project, 3)
+
+        shard_dir = project / 'test-results' / 'shards'
+        ran = []
+        for index in range(1, 4):
+            with open(shard_paths(index, 3, str(shard_dir))['manifest']) as f:
+                ran.extend(json.load(f)['tests'])
+        assert len(ran) == len(set(ran)) == 12
+
+        result = subprocess.run([sys.executable, SHARDING_SCRIPT, 'merge'], cwd=str(project),
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        suite = ET.parse(str(project / 'test-results' / 'junit.xml')).getroot().find('testsuite')
+        assert suite.get('tests') == '12'
+        assert len(json.loads((project / '.test_durations.json').read_text())) == 12
+        assert (project / 'coverage.xml').exists()
+        # half() is never called, so the combined coverage is incomplete
+        assert 'mod.py' in result.stdout
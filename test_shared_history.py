@@ -0,0 +1,169 @@
+"""
+Test cases for the shared-memory history using pytest.
+"""
+
+import multiprocessing
+import os
+import uuid
+
+import pytest
+import shared_history
+from calculator import Calculator
+from shared_history import SharedHistory, truncate
+
+
+@pytest.fixture
+def history_name():
+    """A unique segment name, unlinked after the test."""
+    name = f"test-history-{uuid.uuid4().hex[:12]}"
+    yield name
+    shared_history.unlink(name)
+
+
+@pytest.fixture
+def open_history(history_name):
+    """Open histories on the test's segment, closing them afterwards."""
+    opened = []
+
+    def _open(capacity=8, **kwargs):
+        history = SharedHistory(history_name, capacity=capacity, **kwargs)
+        opened.append(history)
+        return history
+
+    yield _open
+    for history in opened:
+        history.close()
+
+
+def _append_entries(name, worker, count):
+    """Append entries from a separate process."""
+    history = SharedHistory(name, capacity=1024)
+    for i in range(count):
+        history.append(f"worker {worker} entry {i}")
+    history.close()
+
+
+class TestTruncate:
+    """Test fitting entries into fixed-size records."""
+
+    def test_short_entry_unchanged(self):
+        """Test entries that fit are stored as-is."""
+        assert truncate("2 + 3 = 5", 16) == b"2 + 3 = 5"
+
+    def test_long_entry_marked(self):
+        """Test long entries are cut and end with an ellipsis."""
+        data = truncate("x" * 100, 16)
+        assert len(data) == 16
+        assert data.decode('utf-8') == "x" * 13 + "…"
+
+    def test_multibyte_character_not_split(self):
+        """Test truncation never leaves a partial UTF-8 character."""
+        data = truncate("√" * 10, 8)
+        assert len(data) <= 8
+        assert data.decode('utf-8') == "√…"
+
+
+class TestSharedHistory:
+    """Test the ring buffer in a single process."""
+
+    def test_append_and_read(self, open_history):
+        """Test entries are returned oldest first."""
+        history = open_history(8)
+        history.append("1 + 1 = 2")
+        history.append("2 * 3 = 6")
+        assert history.copy() == ["1 + 1 = 2", "2 * 3 = 6"]
+        assert len(history) == 2
+
+    def test_wraps_around_when_full(self, open_history):
+        """Test the oldest entries are overwritten once full."""
+        history = open_history(3)
+        for i in range(5):
+            history.append(str(i))
+        assert history.copy() == ["2", "3", "4"]
+        assert len(history) == 3
+
+    def test_clear(self, open_history):
+        """Test clearing hides old entries but keeps appending."""
+        history = open_history(4)
+        history.append("old")
+        history.clear()
+        assert history.copy() == []
+        history.append("new")
+        assert list(history) == ["new"]
+
+    def test_instances_share_entries(self, open_history):
+        """Test two attachments to one name see the same history."""
+        first = open_history(4)
+        second = open_history(4)
+        first.append("from first")
+        second.append("from second")
+        assert first.copy() == second.copy() == ["from first", "from second"]
+        second.clear()
+        assert first.copy() == []
+
+    def test_layout_mismatch(self, history_name, open_history):
+        """Test attaching with a different layout is rejected."""
+        open_history(4)
+        with pytest.raises(ValueError, match="capacity 4"):
+            SharedHistory(history_name, capacity=8)
+
+    def test_invalid_arguments(self, history_name):
+        """Test invalid capacity and record size raise errors."""
+        with pytest.raises(ValueError, match="Capacity must be positive"):
+            SharedHistory(history_name, capacity=0)
+        with pytest.raises(ValueError, match="Record size"):
+            SharedHistory(history_name, record_size=2)
+
+    def test_calculator_history(self, open_history):
+        """Test a calculator records into and clears the shared history."""
+        calc = Calculator(history=open_history(4))
+        calc.add(2, 3)
+        assert calc.get_history() == ["2 + 3 = 5"]
+        calc.clear_history()
+        assert calc.get_history() == []
+
+
+class TestSharedHistoryProcesses:
+    """Test the ring buffer across processes."""
+
+    def test_concurrent_appends(self, history_name, open_history):
+        """Test every entry appended by concurrent processes is kept exactly once."""
+        history = open_history(1024)
+        processes = [multiprocessing.Process(target=_append_entries, args=(history_name, worker, 100))
+                     for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        entries = history.copy()
+        assert len(entries) == 400
+        assert set(entries) == {f"worker {w} entry {i}" for w in range(4) for i in range(100)}
+        # Each worker's entries keep their order
+        worker_0 = [entry for entry in entries if entry.startswith("worker 0 ")]
+        assert worker_0 == [f"worker 0 entry {i}" for i in range(100)]
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="Requires os.fork")
+    def test_appends_through_inherited_instance(self, open_history):
+        """Test children forked after the history was opened do not overwrite each other."""
+        history = open_history(4096)
+        children = []
+        for worker in range(4):
+            pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    for i in range(500):
+                        history.append(f"worker {worker} entry {i}")
+                    code = 0
+                finally:
+                    os._exit(code)
+            children.append(pid)
+        for pid in children:
+            _, status = os.waitpid(pid, 0)
+            assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+        entries = history.copy()
+        assert len(entries) == 2000
+        assert len(set(entries)) == 2000
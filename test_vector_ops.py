@@ -0,0 +1,133 @@
+"""
+Test cases for the vector operations module using pytest.
+"""
+
+import pytest
+import vector_ops
+from vector_ops import VectorCalculator, decode_array, encode_array
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not vector_ops.HAS_NUMPY, reason="NumPy is not installed")),
+]
+
+
+@pytest.fixture(params=BACKENDS, ids=['python', 'numpy'])
+def calc(request):
+    """Create a vector calculator for each available backend."""
+    return VectorCalculator(use_numpy=request.param)
+
+
+class TestVectorCalculator:
+    """Test class for VectorCalculator methods."""
+
+    def test_elementwise_operations(self, calc):
+        """Test elementwise add, subtract, multiply and divide."""
+        assert list(calc.add([1, 2, 3], [4, 5, 6])) == [5.0, 7.0, 9.0]
+        assert list(calc.subtract([1, 2, 3], [4, 5, 6])) == [-3.0, -3.0, -3.0]
+        assert list(calc.multiply([1, 2, 3], [4, 5, 6])) == [4.0, 10.0, 18.0]
+        assert list(calc.divide([4, 10, 18], [4, 5, 6])) == [1.0, 2.0, 3.0]
+
+    def test_scalar_operand(self, calc):
+        """Test elementwise operations with a scalar second operand."""
+        assert list(calc.add([1, 2], 1)) == [2.0, 3.0]
+        assert list(calc.multiply([1, 2], 2.5)) == [2.5, 5.0]
+
+    def test_reductions(self, calc):
+        """Test sum, mean, min and max."""
+        values = [3, -1, 4, 1, 5]
+        assert calc.sum(values) == 12.0
+        assert calc.mean(values) == 2.4
+        assert calc.min(values) == -1.0
+        assert calc.max(values) == 5.0
+
+    def test_dot(self, calc):
+        """Test the dot product."""
+        assert calc.dot([1, 2, 3], [4, 5, 6]) == 32.0
+
+    def test_matmul(self, calc):
+        """Test matrix multiplication."""
+        result = calc.matmul([[1, 2], [3, 4], [5, 6]], [[1, 0, 2], [0, 1, 3]])
+        assert [list(row) for row in result] == [[1, 2, 8], [3, 4, 18], [5, 6, 28]]
+
+    def test_blocked_fallback_matches_across_blocks(self, monkeypatch):
+        """Test that the pure-Python fallback gives the same result across block boundaries."""
+        monkeypatch.setattr(vector_ops, 'BLOCK_SIZE', 3)
+        monkeypatch.setattr(vector_ops, 'MATMUL_TILE', 2)
+        calc = VectorCalculator(use_numpy=False)
+        a = list(range(1, 11))
+        assert calc.add(a, a) == [2.0 * x for x in a]
+        assert calc.dot(a, a) == 385.0
+        assert calc.sum(a) == 55.0
+        identity = [[1.0 if i == j else 0.0 for j in range(5)] for i in range(5)]
+        matrix = [[float(i * 5 + j) for j in range(5)] for i in range(3)]
+        assert calc.matmul(matrix, identity) == matrix
+
+    def test_divide_by_zero(self, calc):
+        """Test elementwise division by zero raises error."""
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.divide([1, 2], [1, 0])
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.divide([1, 2], 0)
+
+    def test_length_mismatch(self, calc):
+        """Test operations on vectors of different lengths raise error."""
+        with pytest.raises(ValueError, match="same length"):
+            calc.add([1, 2], [1, 2, 3])
+        with pytest.raises(ValueError, match="same length"):
+            calc.dot([1, 2], [1])
+
+    def test_empty_vector(self, calc):
+        """Test operations on empty vectors raise error."""
+        with pytest.raises(ValueError, match="empty"):
+            calc.mean([])
+
+    def test_invalid_elements(self, calc):
+        """Test vectors with non-numeric elements raise error."""
+        with pytest.raises(ValueError, match="array of numbers"):
+            calc.sum([1, 'x'])
+        with pytest.raises(ValueError, match="array of numbers"):
+            calc.sum('123')
+
+    def test_matmul_shape_mismatch(self, calc):
+        """Test multiplying misaligned matrices raises error."""
+        with pytest.raises(ValueError, match="not aligned"):
+            calc.matmul([[1, 2]], [[1, 2]])
+
+    def test_history(self, calc):
+        """Test that operations are recorded in history."""
+        calc.add([1, 2], [3, 4])
+        calc.dot([1, 2], [3, 4])
+        history = calc.get_history()
+        assert history == ["[2] + [2] = [2]", "[2] · [2] = 11.0"]
+        calc.clear_history()
+        assert calc.get_history() == []
+
+    def test_shared_history(self):
+        """Test that a shared history list receives vector entries."""
+        shared = ["1 + 1 = 2"]
+        calc = VectorCalculator(use_numpy=False, history=shared)
+        calc.sum([1, 2])
+        assert shared == ["1 + 1 = 2", "Sum of [2] = 3.0"]
+
+
+class TestBinaryCodec:
+    """Test binary array encoding and decoding."""
+
+    def test_round_trip_vector(self):
+        """Test encoding and decoding a vector."""
+        data = encode_array([1.5, -2.0, 3.25])
+        assert len(data) == 24
+        assert list(decode_array(data, (3,))) == [1.5, -2.0, 3.25]
+
+    def test_round_trip_matrix(self):
+        """Test encoding and decoding a matrix."""
+        data = encode_array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        matrix = decode_array(data, (2, 3))
+        assert [list(row) for row in matrix] == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+    def test_size_mismatch(self):
+        """Test decoding a payload that does not match the shape raises error."""
+        with pytest.raises(ValueError, match="does not match"):
+            decode_array(encode_array([1.0, 2.0]), (3,))
@@ -0,0 +1,56 @@
+"""
+Test cases for watch mode helpers using pytest.
+"""
+
+import os
+
+from watch import ImportGraph, affected_tests, changed_files, scan
+
+
+class TestWatchHelpers:
+    """Test change detection and affected test selection."""
+
+    def test_scan_and_changed_files(self, tmp_path):
+        """Test added, modified and removed files are detected."""
+        (tmp_path / 'a.py').write_text('A = 1\n')
+        (tmp_path / 'b.py').write_text('B = 1\n')
+        (tmp_path / '__pycache__').mkdir()
+        (tmp_path / '__pycache__' / 'ignored.py').write_text('')
+        before = scan(str(tmp_path))
+        assert set(before) == {'a.py', 'b.py'}
+
+        (tmp_path / 'a.py').write_text('A = 22\n')
+        (tmp_path / 'b.py').unlink()
+        (tmp_path / 'c.py').write_text('C = 1\n')
+        assert changed_files(before, scan(str(tmp_path))) == {'a.py', 'b.py', 'c.py'}
+
+    def test_dependents_are_transitive(self, tmp_path, monkeypatch):
+        """Test modules importing a changed module are found transitively."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'calc.py').write_text('import math\n')
+        (tmp_path / 'api.py').write_text('from calc import Calc\n')
+        (tmp_path / 'test_calc.py').write_text('import calc\n')
+        (tmp_path / 'test_api.py').write_text('from api import app\n')
+        (tmp_path / 'test_other.py').write_text('import os\n')
+        graph = ImportGraph(['calc.py', 'api.py', 'test_calc.py', 'test_api.py', 'test_other.py'])
+
+        assert graph.dependents(['calc']) == {'calc', 'api', 'test_calc', 'test_api'}
+        assert affected_tests(graph, ['calc.py']) == ['test_api.py', 'test_calc.py']
+        assert affected_tests(graph, ['api.py']) == ['test_api.py']
+        assert affected_tests(graph, ['test_other.py']) == ['test_other.py']
+
+    def test_graph_update(self, tmp_path, monkeypatch):
+        """Test re-parsing a file updates its imports."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'calc.py').write_text('')
+        (tmp_path / 'test_calc.py').write_text('import os\n')
+        graph = ImportGraph(['calc.py', 'test_calc.py'])
+        assert affected_tests(graph, ['calc.py']) == []
+
+        (tmp_path / 'test_calc.py').write_text('import calc\n')
+        graph.update('test_calc.py')
+        assert affected_tests(graph, ['calc.py']) == ['test_calc.py']
+
+        os.remove(tmp_path / 'test_calc.py')
+        graph.update('test_calc.py')
+        assert 'test_calc' not in graph.imports
@@ -0,0 +1,318 @@
+"""
+Vector and Matrix Operations Module
+Provides elementwise, reduction and linear algebra operations on arrays of numbers.
+Uses NumPy when it is installed and falls back to a blocked pure-Python implementation.
+"""
+
+import importlib.util
+import operator
+import sys
+from array import array
+from functools import reduce
+from typing import Any, List, Optional, Sequence, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# NumPy is imported on first use; it costs more to import than everything else
+# the API needs, and the pure-Python backend never touches it
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+_np = None
+
+# Number of elements processed per block by the pure-Python fallback
+BLOCK_SIZE = 4096
+
+# Number of output columns computed per tile by the pure-Python matmul
+MATMUL_TILE = 64
+
+
+def _numpy():
+    """Import NumPy on first use."""
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+def _is_numpy(values: Any) -> bool:
+    """Whether values is a NumPy array or scalar, without importing NumPy."""
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(values, (numpy.ndarray, numpy.generic))
+
+
+def _prod(shape: Sequence[int]) -> int:
+    """Return the number of elements in an array of the given shape."""
+    return reduce(operator.mul, shape, 1)
+
+
+def _blocks(length: int):
+    """Yield (start, stop) bounds covering range(length) in BLOCK_SIZE steps."""
+    for start in range(0, length, BLOCK_SIZE):
+        yield start, min(start + BLOCK_SIZE, length)
+
+
+def shape_of(values: Any) -> Tuple[int, ...]:
+    """Return the shape of a vector or matrix (NumPy array or nested lists)."""
+    if _is_numpy(values):
+        return tuple(values.shape)
+    if values and isinstance(values[0], (list, tuple)):
+        return (len(values), len(values[0]))
+    return (len(values),)
+
+
+def to_list(values: Any) -> Union[float, List]:
+    """Convert a result into plain Python floats/lists for JSON responses."""
+    if _is_numpy(values):
+        return values.tolist()
+    return values
+
+
+def decode_array(data: bytes, shape: Sequence[int]) -> Any:
+    """
+    Decode little-endian float64 bytes into a vector or matrix.
+
+    Returns a NumPy array when NumPy is installed, otherwise (nested) lists.
+    """
+    if len(shape) not in (1, 2) or any(dim <= 0 for dim in shape):
+        raise ValueError("Shape must have one or two positive dimensions")
+    if len(data) != 8 * _prod(shape):
+        raise ValueError("Binary payload size does not match shape")
+    if HAS_NUMPY:
+        return _numpy().frombuffer(data, dtype='<f8').reshape(shape)
+    values = array('d')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    flat = values.tolist()
+    if len(shape) == 1:
+        return flat
+    rows, cols = shape
+    return [flat[i * cols:(i + 1) * cols] for i in range(rows)]
+
+
+def encode_array(values: Any) -> bytes:
+    """Encode a vector or matrix as little-endian float64 bytes."""
+    if _is_numpy(values):
+        return _numpy().ascontiguousarray(values, dtype='<f8').tobytes()
+    if values and isinstance(values[0], (list, tuple)):
+        flat = array('d', (x for row in values for x in row))
+    else:
+        flat = array('d', values)
+    if sys.byteorder == 'big':
+        flat.byteswap()
+    return flat.tobytes()
+
+
+class VectorCalculator:
+    """
+    Vector and matrix counterpart of Calculator.
+
+    Results are NumPy arrays when the NumPy backend is active and lists otherwise.
+    Invalid input raises ValueError and every successful operation is recorded
+    in the history, just like Calculator.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None, history: Optional[List[str]] = None):
+        if use_numpy and not HAS_NUMPY:
+            raise ValueError("NumPy backend requested but NumPy is not installed")
+        self.use_numpy = HAS_NUMPY if use_numpy is None else use_numpy
+        # Passing Calculator.history here makes both calculators share one history
+        self.history = history if history is not None else []
+
+    @property
+    def backend(self) -> str:
+        """Name of the active backend."""
+        return 'numpy' if self.use_numpy else 'python'
+
+    # Validation helpers
+
+    def _vector(self, values: Any, name: str = 'vector') -> Any:
+        """Validate and convert input into a one-dimensional vector."""
+        message = f"{name} must be a one-dimensional array of numbers"
+        if isinstance(values, (str, bytes)):
+            raise ValueError(message)
+        try:
+            if self.use_numpy:
+                vector = _numpy().asarray(values, dtype=float)
+            else:
+                vector = [float(x) for x in values]
+        except (TypeError, ValueError):
+            raise ValueError(message)
+        if self.use_numpy and vector.ndim != 1:
+            raise ValueError(message)
+        if len(vector) == 0:
+            raise ValueError(f"Cannot operate on empty {name}")
+        return vector
+
+    def _matrix(self, values: Any, name: str = 'matrix') -> Any:
+        """Validate and convert input into a two-dimensional matrix."""
+        message = f"{name} must be a two-dimensional array of numbers"
+        if isinstance(values, (str, bytes)):
+            raise ValueError(message)
+        try:
+            if self.use_numpy:
+                matrix = _numpy().asarray(values, dtype=float)
+            else:
+                matrix = [[float(x) for x in row] for row in values]
+        except (TypeError, ValueError):
+            raise ValueError(message)
+        if self.use_numpy and matrix.ndim != 2:
+            raise ValueError(message)
+        if len(matrix) == 0 or len(matrix[0]) == 0:
+            raise ValueError(f"Cannot operate on empty {name}")
+        if not self.use_numpy and any(len(row) != len(matrix[0]) for row in matrix):
+            raise ValueError(f"{name} rows must all have the same length")
+        return matrix
+
+    def _operands(self, a: Any, b: Any) -> Tuple[Any, Any]:
+        """Validate a vector and a vector-or-scalar operand of matching length."""
+        a = self._vector(a, 'a')
+        if isinstance(b, (int, float)):
+            return a, float(b)
+        b = self._vector(b, 'b')
+        if len(a) != len(b):
+            raise ValueError(f"Vectors must have the same length ({len(a)} != {len(b)})")
+        return a, b
+
+    @staticmethod
+    def _describe(values: Any) -> str:
+        """Short history description of an operand."""
+        if isinstance(values, float):
+            return str(values)
+        return f"[{'x'.join(str(dim) for dim in shape_of(values))}]"
+
+    def _record(self, entry: str) -> None:
+        """Append an entry to the calculation history."""
+        self.history.append(entry)
+
+    # Elementwise operations
+
+    def _elementwise(self, op, symbol: str, a: Any, b: Any) -> Any:
+        """Apply a binary operator elementwise, block by block in the fallback."""
+        if self.use_numpy:
+            result = op(a, b)
+        elif isinstance(b, float):
+            result = []
+            for start, stop in _blocks(len(a)):
+                result.extend(op(x, b) for x in a[start:stop])
+        else:
+            result = []
+            for start, stop in _blocks(len(a)):
+                result.extend(map(op, a[start:stop], b[start:stop]))
+        self._record(f"{self._describe(a)} {symbol} {self._describe(b)} = {self._describe(result)}")
+        return result
+
+    def add(self, a: Any, b: Any) -> Any:
+        """Add two vectors (or a vector and a scalar) elementwise."""
+        a, b = self._operands(a, b)
+        return self._elementwise(operator.add, '+', a, b)
+
+    def subtract(self, a: Any, b: Any) -> Any:
+        """Subtract b from a elementwise."""
+        a, b = self._operands(a, b)
+        return self._elementwise(operator.sub, '-', a, b)
+
+    def multiply(self, a: Any, b: Any) -> Any:
+        """Multiply two vectors (or a vector and a scalar) elementwise."""
+        a, b = self._operands(a, b)
+        return self._elementwise(operator.mul, '*', a, b)
+
+    def divide(self, a: Any, b: Any) -> Any:
+        """Divide a by b elementwise."""
+        a, b = self._operands(a, b)
+        if isinstance(b, float):
+            has_zero = b == 0
+        elif self.use_numpy:
+            has_zero = not _numpy().all(b)
+        else:
+            has_zero = 0.0 in b
+        if has_zero:
+            raise ValueError("Cannot divide by zero")
+        return self._elementwise(operator.truediv, '/', a, b)
+
+    # Reductions
+
+    def dot(self, a: Any, b: Any) -> float:
+        """Calculate the dot product of two vectors."""
+        a = self._vector(a, 'a')
+        b = self._vector(b, 'b')
+        if len(a) != len(b):
+            raise ValueError(f"Vectors must have the same length ({len(a)} != {len(b)})")
+        if self.use_numpy:
+            result = float(_numpy().dot(a, b))
+        else:
+            result = 0.0
+            for start, stop in _blocks(len(a)):
+                result += sum(map(operator.mul, a[start:stop], b[start:stop]))
+        self._record(f"{self._describe(a)} · {self._describe(b)} = {result}")
+        return result
+
+    def sum(self, values: Any) -> float:
+        """Calculate the sum of a vector."""
+        values = self._vector(values, 'values')
+        if self.use_numpy:
+            result = float(_numpy().sum(values))
+        else:
+            result = 0.0
+            for start, stop in _blocks(len(values)):
+                result += sum(values[start:stop])
+        self._record(f"Sum of {self._describe(values)} = {result}")
+        return result
+
+    def mean(self, values: Any) -> float:
+        """Calculate the mean of a vector."""
+        values = self._vector(values, 'values')
+        if self.use_numpy:
+            result = float(_numpy().mean(values))
+        else:
+            total = 0.0
+            for start, stop in _blocks(len(values)):
+                total += sum(values[start:stop])
+            result = total / len(values)
+        self._record(f"Mean of {self._describe(values)} = {result}")
+        return result
+
+    def min(self, values: Any) -> float:
+        """Find the smallest element of a vector."""
+        values = self._vector(values, 'values')
+        result = float(_numpy().min(values)) if self.use_numpy else min(values)
+        self._record(f"Min of {self._describe(values)} = {result}")
+        return result
+
+    def max(self, values: Any) -> float:
+        """Find the largest element of a vector."""
+        values = self._vector(values, 'values')
+        result = float(_numpy().max(values)) if self.use_numpy else max(values)
+        self._record(f"Max of {self._describe(values)} = {result}")
+        return result
+
+    # Linear algebra
+
+    def matmul(self, a: Any, b: Any) -> Any:
+        """Multiply two matrices."""
+        a = self._matrix(a, 'a')
+        b = self._matrix(b, 'b')
+        (rows, inner), (inner_b, cols) = shape_of(a), shape_of(b)
+        if inner != inner_b:
+            raise ValueError(f"Matrix shapes {rows}x{inner} and {inner_b}x{cols} are not aligned")
+        if self.use_numpy:
+            result = a @ b
+        else:
+            columns = list(zip(*b))
+            result = [[0.0] * cols for _ in range(rows)]
+            for first in range(0, cols, MATMUL_TILE):
+                tile = columns[first:first + MATMUL_TILE]
+                for row, out in zip(a, result):
+                    for j, column in enumerate(tile, first):
+                        out[j] = sum(map(operator.mul, row, column))
+        self._record(f"{self._describe(a)} @ {self._describe(b)} = {self._describe(result)}")
+        return result
+
+    def clear_history(self):
+        """Clear the calculation history."""
+        self.history.clear()
+
+    def get_history(self) -> List[str]:
+        """Get the calculation history."""
+        return self.history.copy()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Watch mode for local development.
+Keeps a warm worker with Flask, requests and the project modules already
+imported, polls for file changes, reloads only the changed modules and
+reruns the tests affected by them.
+"""
+
+import argparse
+import ast
+import importlib
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Third-party modules imported once by the warm worker
+PRELOAD = ['pytest', 'flask', 'werkzeug', 'requests', 'numpy', 'coverage', 'pytest_cov']
+
+# Directories never scanned for changes
+IGNORED_DIRS = {'.git', 'venv', '.venv', '__pycache__', '.pytest_cache', 'htmlcov', 'test-results'}
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def is_test_module(name: str) -> bool:
+    """Whether a module name is a pytest test module."""
+    return name.startswith('test_') or name == 'conftest'
+
+
+def scan(root: str = '.') -> Snapshot:
+    """Map every Python file under root to its (mtime_ns, size)."""
+    snapshot = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    stat = entry.stat()
+                    snapshot[os.path.relpath(entry.path, root)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> Set[str]:
+    """Files added, removed or modified between two snapshots."""
+    return {path for path in set(before) | set(after) if before.get(path) != after.get(path)}
+
+
+def module_name(path: str) -> str:
+    """Convert a relative .py path into a module name."""
+    return path[:-3].replace(os.sep, '.')
+
+
+class ImportGraph:
+    """Static graph of which project modules import which."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.imports = {}
+        for path in paths:
+            self.update(path)
+
+    def update(self, path: str) -> None:
+        """(Re)parse one file's imports; a missing file is dropped from the graph."""
+        name = module_name(path)
+        try:
+            with open(path) as f:
+                tree = ast.parse(f.read(), filename=path)
+        except FileNotFoundError:
+            self.imports.pop(name, None)
+            return
+        except SyntaxError:
+            # Keep the previous edges until the file parses again
+            self.imports.setdefault(name, set())
+            return
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imported.add(node.module)
+        self.imports[name] = imported
+
+    def dependents(self, modules: Iterable[str]) -> Set[str]:
+        """The given modules plus every project module that imports them, transitively."""
+        result = set(modules)
+        pending = list(result)
+        while pending:
+            target = pending.pop()
+            for name, imported in self.imports.items():
+                if name not in result and target in imported:
+                    result.add(name)
+                    pending.append(name)
+        return result
+
+    def project_modules(self) -> List[str]:
+        """Names of all modules in the graph."""
+        return sorted(self.imports)
+
+
+class WarmWorker:
+    """
+    Process that keeps dependencies and project modules imported.
+
+    Each test run happens in a forked child so runs start warm but never
+    leak state (such as the API's global calculator) into later runs.
+    """
+
+    def __init__(self, graph: ImportGraph, pytest_args: List[str]):
+        self.graph = graph
+        self.pytest_args = pytest_args
+        for name in PRELOAD:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+        self.reload(name for name in graph.project_modules() if not is_test_module(name))
+
+    def reload(self, modules: Iterable[str]) -> None:
+        """Drop modules from sys.modules and re-import the non-test ones."""
+        modules = list(modules)
+        for name in modules:
+            sys.modules.pop(name, None)
+        for name in modules:
+            # Test modules are left to pytest so their asserts get rewritten
+            if is_test_module(name) or name not in self.graph.imports:
+                continue
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # pytest will report the error when it imports the module
+                sys.modules.pop(name, None)
+                print(f"Could not reload {name}: {e}")
+
+    def run(self, targets: List[str]) -> int:
+        """Run pytest on targets in a forked child and return its exit code."""
+        import pytest
+
+        args = ['-q', '-p', 'no:cacheprovider', *self.pytest_args, *targets]
+        if not hasattr(os, 'fork'):
+            return int(pytest.main(args))
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = int(pytest.main(args))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status >> 8
+
+
+def affected_tests(graph: ImportGraph, changed: Iterable[str]) -> List[str]:
+    """Test files that are, or transitively import, one of the changed files."""
+    modules = graph.dependents(module_name(path) for path in changed)
+    return sorted(f"{name.replace('.', os.sep)}.py" for name in modules
+                  if name.rsplit('.', 1)[-1].startswith('test_')
+                  and os.path.exists(f"{name.replace('.', os.sep)}.py"))
+
+
+def watch(pytest_args: List[str], interval: float = 0.2, settle: float = 0.05,
+          max_runs: Optional[int] = None) -> None:
+    """Poll for changes and rerun affected tests until interrupted."""
+    snapshot = scan()
+    graph = ImportGraph(snapshot)
+    worker = WarmWorker(graph, pytest_args)
+    print(f"Watching {len(snapshot)} files. Press Ctrl+C to stop.")
+
+    runs = 0
+    while max_runs is None or runs < max_runs:
+        time.sleep(interval)
+        current = scan()
+        changed = changed_files(snapshot, current)
+        if not changed:
+            continue
+        # Let editors finish writing related files before running
+        time.sleep(settle)
+        current = scan()
+        changed |= changed_files(snapshot, current)
+        snapshot = current
+
+        started = time.perf_counter()
+        for path in changed:
+            graph.update(path)
+        run_all = any(os.path.basename(path) == 'conftest.py' for path in changed)
+        targets = [] if run_all else affected_tests(graph, changed)
+        worker.reload(graph.dependents(module_name(path) for path in changed))
+
+        print(f"\n{'='*50}")
+        print(f"Changed: {', '.join(sorted(changed))}")
+        if run_all or targets:
+            print(f"Running: {', '.join(targets) or 'all tests'}")
+            print('='*50)
+            code = worker.run(targets)
+            status = "PASSED" if code in (0, 5) else "FAILED"
+            print(f"{status} in {time.perf_counter() - started:.2f}s")
+        else:
+            print("No tests affected")
+        runs += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rerun affected tests when files change')
+    parser.add_argument('--interval', type=float, default=0.2, help='Polling interval in seconds')
+
+    args, pytest_args = parser.parse_known_args()
+
+    try:
+        watch(pytest_args or ['-m', 'not integration'], interval=args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+if __name__ == '__main__':
+    main()